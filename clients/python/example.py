@@ -8,7 +8,7 @@ import time
 import os
 import platform
 import psutil
-from grandmaster_client import GrandmasterClient
+from grandmaster_client import Command, GrandmasterClient
 
 # Configure logging
 logging.basicConfig(
@@ -20,6 +20,9 @@ logger = logging.getLogger("example-app")
 # Track application start time
 start_time = time.time()
 
+# Prime the CPU counter so later non-blocking samples have a baseline
+psutil.cpu_percent(interval=None)
+
 # Callback functions
 async def on_connect():
     """Called when connected to Grandmaster."""
@@ -34,7 +37,7 @@ async def send_periodic_updates():
         try:
             # Get system metrics
             memory = psutil.virtual_memory()
-            cpu = psutil.cpu_percent(interval=1)
+            cpu = psutil.cpu_percent(interval=None)
             disk = psutil.disk_usage('/')
             
             # Send status update
@@ -63,42 +66,53 @@ async def send_periodic_updates():
         # Wait before sending next update
         await asyncio.sleep(30)
 
+async def handle_restart(message):
+    """Handle the restart command."""
+    logger.info("Received restart command")
+    # Implement restart logic here
+
+async def handle_status(message):
+    """Send an immediate status update."""
+    memory = psutil.virtual_memory()
+    # Sample in a worker thread so the event loop keeps running
+    cpu = await asyncio.to_thread(psutil.cpu_percent, 0.1)
+    
+    await client.send(
+        "Status report (on demand)", 
+        {
+            "status": "responding",
+            "timestamp": time.time(),
+            "cpu": cpu,
+            "memory": memory.percent
+        }
+    )
+
+async def handle_ping(message):
+    """Respond to a ping."""
+    await client.send(
+        "pong",
+        {
+            "responseId": message.get("id"),
+            "latency_ms": round((time.time() - float(message.get("timestamp", 0))) * 1000, 2)
+        }
+    )
+
+# Command name -> handler coroutine
+COMMAND_HANDLERS = {
+    "restart": handle_restart,
+    "status": handle_status,
+    "ping": handle_ping
+}
+
 async def on_message(message):
     """Handle messages from Grandmaster."""
     logger.info(f"Received message: {message}")
     
     # Handle commands from Grandmaster
-    if isinstance(message, dict) and message.get("command"):
-        command = message.get("command")
-        
-        if command == "restart":
-            logger.info("Received restart command")
-            # Implement restart logic here
-            
-        elif command == "status":
-            # Send immediate status update
-            memory = psutil.virtual_memory()
-            cpu = psutil.cpu_percent(interval=0.1)
-            
-            await client.send(
-                "Status report (on demand)", 
-                {
-                    "status": "responding",
-                    "timestamp": time.time(),
-                    "cpu": cpu,
-                    "memory": memory.percent
-                }
-            )
-        
-        elif command == "ping":
-            # Respond to ping
-            await client.send(
-                "pong",
-                {
-                    "responseId": message.get("id"),
-                    "latency_ms": round((time.time() - float(message.get("timestamp", 0))) * 1000, 2)
-                }
-            )
+    if isinstance(message, Command):
+        handler = COMMAND_HANDLERS.get(message.command)
+        if handler:
+            await handler(message)
 
 def on_error(error):
     """Handle connection errors."""
@@ -6,17 +6,134 @@ import asyncio
 import json
 import logging
 import os
+import random
 import signal
 import time
-from typing import Any, Callable, Dict, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 
 import websockets
 
+try:
+    import orjson
+
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+    _JSONDecodeError = orjson.JSONDecodeError
+except ImportError:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+    _loads = json.loads
+    _JSONDecodeError = json.JSONDecodeError
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# Outbound queue tuning
+OUTBOUND_QUEUE_SIZE = 1024  # Max frames waiting to be written
+MIN_BATCH_SIZE = 32         # Frames flushed together when the queue is shallow
+MAX_BATCH_SIZE = 256        # Upper bound the batch grows to under a backlog
+FLUSH_TIMEOUT = 2.0         # Seconds to wait for queued frames on disconnect
+EXECUTOR_WORKERS = 4        # Threads backing run_in_executor/asyncio.to_thread
+
+# (epoch second, formatted timestamp) of the last formatted second
+_TS_CACHE = (0, b"")
+
+
+def _iso_now_bytes() -> bytes:
+    """Get the current ISO-8601 timestamp as bytes, formatted at most once per second."""
+    global _TS_CACHE
+    now = int(time.time())
+    cached_second, cached = _TS_CACHE
+    if now == cached_second:
+        return cached
+    # Formatted from gmtime in UTC; avoids strftime's %z timezone lookup
+    t = time.gmtime(now)
+    formatted = b"%04d-%02d-%02dT%02d:%02d:%02d+0000" % (
+        t.tm_year, t.tm_mon, t.tm_mday, t.tm_hour, t.tm_min, t.tm_sec
+    )
+    # Swap the whole tuple so readers in other threads never see a torn pair
+    _TS_CACHE = (now, formatted)
+    return formatted
+
+
+def _as_async(callback: Optional[Callable]) -> Optional[Callable]:
+    """Wrap a plain callback in a coroutine function; coroutine functions pass through."""
+    if callback is None or asyncio.iscoroutinefunction(callback):
+        return callback
+    
+    async def wrapper(*args, **kwargs):
+        return callback(*args, **kwargs)
+    
+    return wrapper
+
+
+class _Callback:
+    """Public callback attribute that keeps a coroutine-function copy in _<name> for dispatch."""
+    
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.private_name = f"_{name}"
+    
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return obj.__dict__.get(self.name)
+    
+    def __set__(self, obj, value):
+        obj.__dict__[self.name] = value
+        setattr(obj, self.private_name, _as_async(value))
+
+
+def iso_timestamp() -> str:
+    """Get the current second-resolution ISO-8601 timestamp."""
+    return _iso_now_bytes().decode()
+
+
+class Command(dict):
+    """
+    A command message received from Grandmaster.
+    
+    A plain dict of the parsed message, so existing callbacks keep working,
+    with the common fields also readable as attributes.
+    """
+    
+    __slots__ = ()
+    
+    @property
+    def command(self) -> Optional[str]:
+        return self.get("command")
+    
+    @property
+    def id(self) -> Any:
+        return self.get("id")
+    
+    @property
+    def timestamp(self) -> Optional[str]:
+        return self.get("timestamp")
+    
+    @property
+    def raw(self) -> Dict[str, Any]:
+        return self
+    
+    def __repr__(self) -> str:
+        return f"Command({dict.__repr__(self)})"
+
 
 class GrandmasterClient:
     """
     Client for connecting to the Grandmaster WebSocket server.
     """
+    
+    # Callbacks can be replaced after construction; each assignment re-wraps the
+    # dispatch copy, so dispatch never re-checks whether a callback is async
+    on_connect = _Callback()
+    on_message = _Callback()
+    on_error = _Callback()
+    on_close = _Callback()
 
     def __init__(
         self,
@@ -29,6 +146,9 @@ class GrandmasterClient:
         reconnect_interval: float = 5.0,
         max_reconnect_attempts: int = 10,
         log_level: str = "INFO",
+        backoff_min: float = 1.92,
+        backoff_factor: float = 1.618,
+        backoff_max: float = 60.0,
     ):
         """
         Initialize the Grandmaster client.
@@ -40,9 +160,12 @@ class GrandmasterClient:
             on_message: Callback function when message received
             on_error: Callback function when error occurs
             on_close: Callback function when connection closes
-            reconnect_interval: Reconnect interval in seconds
+            reconnect_interval: Upper bound in seconds of the random delay before the first reconnect
             max_reconnect_attempts: Max reconnect attempts
             log_level: Logging level
+            backoff_min: Delay in seconds before the second reconnect attempt
+            backoff_factor: Multiplier applied to the delay after each further attempt
+            backoff_max: Maximum delay in seconds between reconnect attempts
         """
         self.url = url or os.environ.get("GRANDMASTER_URL", "ws://grandmaster:8765")
         self.app_name = app_name or os.environ.get("APP_NAME", "python-app")
@@ -52,6 +175,9 @@ class GrandmasterClient:
         self.on_close = on_close
         self.reconnect_interval = reconnect_interval
         self.max_reconnect_attempts = max_reconnect_attempts
+        self.backoff_min = backoff_min
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
         
         # Setup logging
         self.logger = logging.getLogger("grandmaster-client")
@@ -61,11 +187,22 @@ class GrandmasterClient:
             handler.setFormatter(logging.Formatter('%(asctime)s [%(levelname)s] %(name)s: %(message)s'))
             self.logger.addHandler(handler)
         
+        # Pre-serialized '{"app":"<name>",' prefix shared by every outgoing message
+        self._app_prefix = _dumps({"app": self.app_name})[:-1] + b','
+        
+        # Lifecycle messages never change, so only the timestamp is filled in per send
+        self._hello_template = self._build_template(f"✅ App connected: {self.app_name}")
+        self._goodbye_template = self._build_template(f"🔌 App disconnecting: {self.app_name}")
+        
         self.websocket = None
         self.reconnect_count = 0
+        self._backoff = backoff_min
         self.connected = False
         self.running = False
         self.loop = None
+        self._shutting_down = False
+        self._out_q: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
 
     async def connect(self):
         """Connect to the Grandmaster server."""
@@ -79,20 +216,30 @@ class GrandmasterClient:
                     self.websocket = websocket
                     self.connected = True
                     self.reconnect_count = 0
+                    self._backoff = self.backoff_min
                     self.logger.info(f"Connected to Grandmaster")
                     
-                    # Send initial connection message
-                    await self.send(f"✅ App connected: {self.app_name}")
-                    
-                    # Call on_connect callback
-                    if self.on_connect:
-                        if asyncio.iscoroutinefunction(self.on_connect):
-                            await self.on_connect()
-                        else:
-                            self.on_connect()
+                    # Start the outbound writer for this connection
+                    self._out_q = asyncio.Queue(maxsize=OUTBOUND_QUEUE_SIZE)
+                    self._writer_task = asyncio.create_task(self._writer(websocket, self._out_q))
                     
-                    # Start the message listener
-                    await self._listen_for_messages()
+                    try:
+                        # Send initial connection message
+                        await self._send_template(self._hello_template)
+                        
+                        # Call on_connect callback
+                        if self._on_connect:
+                            await self._on_connect()
+                        
+                        # Start the message listener
+                        await self._listen_for_messages()
+                    finally:
+                        # Frames queued after this point would never be written,
+                        # so send() reports False until the next connection
+                        self._writer_task.cancel()
+                        self._out_q = None
+                        self.connected = False
+                        self.websocket = None
             
             except (websockets.exceptions.ConnectionClosed, 
                     websockets.exceptions.ConnectionError,
@@ -100,18 +247,15 @@ class GrandmasterClient:
                 self.connected = False
                 self.websocket = None
                 
-                if self.on_error:
-                    if asyncio.iscoroutinefunction(self.on_error):
-                        await self.on_error(e)
-                    else:
-                        self.on_error(e)
+                if self._on_error:
+                    await self._on_error(e)
                 
                 self.logger.warning(f"Connection error: {e}")
                 
                 if self.running:
                     self.reconnect_count += 1
                     if self.reconnect_count < self.max_reconnect_attempts:
-                        retry_in = self.reconnect_interval * (2 ** min(self.reconnect_count - 1, 5))
+                        retry_in = self._next_retry_delay()
                         self.logger.info(f"Reconnecting ({self.reconnect_count}/{self.max_reconnect_attempts}) in {retry_in:.1f}s...")
                         await asyncio.sleep(retry_in)
                     else:
@@ -120,37 +264,78 @@ class GrandmasterClient:
             
             except Exception as e:
                 self.logger.error(f"Unexpected error: {e}")
-                if self.on_error:
-                    if asyncio.iscoroutinefunction(self.on_error):
-                        await self.on_error(e)
-                    else:
-                        self.on_error(e)
+                if self._on_error:
+                    await self._on_error(e)
                 break
         
         self.connected = False
         self.websocket = None
         
-        if self.on_close:
-            if asyncio.iscoroutinefunction(self.on_close):
-                await self.on_close()
-            else:
-                self.on_close()
+        if self._on_close:
+            await self._on_close()
+
+    def _next_retry_delay(self) -> float:
+        """
+        Get the delay before the next reconnect attempt.
+        
+        The first retry waits a random fraction of reconnect_interval so that
+        clients dropped together do not reconnect together; later retries back
+        off exponentially from backoff_min up to backoff_max.
+        """
+        if self.reconnect_count == 1:
+            return random.random() * self.reconnect_interval
+        
+        delay = self._backoff
+        self._backoff = min(self._backoff * self.backoff_factor, self.backoff_max)
+        return delay
 
     async def _listen_for_messages(self):
         """Listen for messages from the server."""
         async for message in self.websocket:
+            # Text frames arrive as str and binary frames as bytes; both are
+            # parsed as delivered, without an intermediate encode/decode
             try:
-                data = json.loads(message)
-            except json.JSONDecodeError:
+                data = _loads(message)
+            except _JSONDecodeError:
                 data = {"content": message}
+            else:
+                if isinstance(data, dict) and "command" in data:
+                    data = Command(data)
             
             self.logger.debug(f"Received message: {data}")
             
-            if self.on_message:
-                if asyncio.iscoroutinefunction(self.on_message):
-                    await self.on_message(data)
-                else:
-                    self.on_message(data)
+            if self._on_message:
+                await self._on_message(data)
+
+    async def _writer(self, websocket, queue: asyncio.Queue):
+        """
+        Drain the outbound queue, writing queued frames in batches.
+        
+        The batch grows while a backlog remains and falls back to
+        MIN_BATCH_SIZE once the queue is empty, so idle sends go out at once.
+        """
+        batch_size = MIN_BATCH_SIZE
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            
+            try:
+                results = await asyncio.gather(
+                    *[websocket.send(payload) for payload in batch],
+                    return_exceptions=True
+                )
+                for result in results:
+                    if isinstance(result, Exception):
+                        self.logger.error(f"Error sending message: {result}")
+            finally:
+                for _ in batch:
+                    queue.task_done()
+            
+            if queue.qsize() > batch_size:
+                batch_size = min(batch_size * 2, MAX_BATCH_SIZE)
+            elif queue.empty():
+                batch_size = MIN_BATCH_SIZE
 
     async def send(self, content: str, additional_data: Dict[str, Any] = None) -> bool:
         """
@@ -161,28 +346,71 @@ class GrandmasterClient:
             additional_data: Additional data to include
             
         Returns:
-            True if the message was sent successfully, False otherwise
+            True if the message was queued for sending, False otherwise
         """
-        if not self.connected or not self.websocket:
+        queue = self._out_q
+        if queue is None or not self.connected:
             return False
         
+        timestamp = _iso_now_bytes()
+        
         try:
-            message = {
-                "app": self.app_name,
-                "content": content,
-                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z")
-            }
-            
             if additional_data:
-                message.update(additional_data)
+                message = {
+                    "app": self.app_name,
+                    "content": content,
+                    "timestamp": timestamp.decode(),
+                    **additional_data
+                }
+                payload = _dumps(message)
+            else:
+                # Plain messages are assembled from the cached prefix without a dict
+                payload = b''.join((
+                    self._app_prefix,
+                    b'"content":', _dumps(content),
+                    b',"timestamp":"', timestamp,
+                    b'"}'
+                ))
+        except (TypeError, ValueError) as e:
+            self.logger.error(f"Error serializing message: {e}")
+            return False
+        
+        # Serialized bytes go out as-is, skipping the str -> UTF-8 encode
+        await queue.put(payload)
+        self.logger.debug(f"Queued message: {content}")
+        return True
+
+    def _build_template(self, content: str) -> Tuple[bytes, bytes]:
+        """
+        Pre-serialize a message with constant content.
+        
+        Args:
+            content: Message content
             
-            await self.websocket.send(json.dumps(message))
-            self.logger.debug(f"Sent message: {content}")
-            return True
+        Returns:
+            The serialized message split around the timestamp value
+        """
+        return (
+            self._app_prefix + b'"content":' + _dumps(content) + b',"timestamp":"',
+            b'"}'
+        )
+
+    async def _send_template(self, template: Tuple[bytes, bytes]) -> bool:
+        """
+        Send a pre-serialized message from _build_template with the current timestamp.
         
-        except Exception as e:
-            self.logger.error(f"Error sending message: {e}")
+        Args:
+            template: The serialized message halves
+            
+        Returns:
+            True if the message was queued for sending, False otherwise
+        """
+        queue = self._out_q
+        if queue is None or not self.connected:
             return False
+        
+        await queue.put(template[0] + _iso_now_bytes() + template[1])
+        return True
 
     async def disconnect(self):
         """Disconnect from the Grandmaster server."""
@@ -191,7 +419,13 @@ class GrandmasterClient:
         if self.connected and self.websocket:
             try:
                 # Send goodbye message
-                await self.send(f"🔌 App disconnecting: {self.app_name}")
+                await self._send_template(self._goodbye_template)
+                
+                # Let the writer flush queued frames before closing
+                try:
+                    await asyncio.wait_for(self._out_q.join(), timeout=FLUSH_TIMEOUT)
+                except asyncio.TimeoutError:
+                    self.logger.warning("Timed out flushing queued messages")
                 
                 # Close the connection
                 await self.websocket.close()
@@ -203,8 +437,13 @@ class GrandmasterClient:
         self.logger.info("Disconnected from Grandmaster")
 
     def start(self):
-        """Start the client in the current event loop."""
-        self.loop = asyncio.get_event_loop()
+        """Start the client on a new event loop and run until disconnected."""
+        # Prefer the libuv-based event loop when it is installed, without touching the global policy
+        self.loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.loop.set_default_executor(
+            ThreadPoolExecutor(max_workers=EXECUTOR_WORKERS, thread_name_prefix="grandmaster-client")
+        )
         
         # Set up signal handlers
         for sig in (signal.SIGINT, signal.SIGTERM):
@@ -218,13 +457,39 @@ class GrandmasterClient:
             self.loop.run_until_complete(self.connect())
         except Exception as e:
             self.logger.error(f"Error in event loop: {e}")
+        finally:
+            self._close_loop()
+    
+    def _close_loop(self):
+        """Cancel leftover tasks, shut down async generators and the executor, and close the loop."""
+        try:
+            pending = asyncio.all_tasks(self.loop)
+            for task in pending:
+                task.cancel()
+            self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+            self.loop.run_until_complete(self.loop.shutdown_default_executor())
+        finally:
+            asyncio.set_event_loop(None)
+            self.loop.close()
     
     def _handle_signal(self, sig):
         """Handle termination signals."""
+        # Repeated signals must not schedule another shutdown
+        if self._shutting_down:
+            return
+        self._shutting_down = True
+        self.running = False
+        
         self.logger.info(f"Received signal {sig}, shutting down...")
         if self.loop and self.loop.is_running():
-            asyncio.create_task(self.disconnect())
-            self.loop.call_later(2, self.loop.stop)
+            # Schedule from the loop itself, whichever context the signal arrived in
+            self.loop.call_soon_threadsafe(self._shutdown)
+    
+    def _shutdown(self):
+        """Disconnect and stop the event loop once the goodbye and close handshake are done; runs on the loop."""
+        task = asyncio.ensure_future(self.disconnect())
+        task.add_done_callback(lambda _: self.loop.stop())
 
     def __enter__(self):
         """Start the client when used as context manager."""
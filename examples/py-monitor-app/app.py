@@ -10,8 +10,10 @@ import os
 import platform
 import psutil
 import time
+from collections import deque
 from datetime import datetime
-from grandmaster_client import GrandmasterClient
+from itertools import islice
+from grandmaster_client import Command, GrandmasterClient, iso_timestamp
 
 # Configure logging
 logging.basicConfig(
@@ -24,22 +26,57 @@ logger = logging.getLogger("monitor-app")
 METRICS_INTERVAL = 5  # Collect metrics every 5 seconds
 REPORT_INTERVAL = 30  # Send detailed report every 30 seconds
 MAX_HISTORY = 100     # Maximum number of metrics to keep in history
+AVERAGE_WINDOW = REPORT_INTERVAL // METRICS_INTERVAL  # Samples averaged in each report
 ALERT_THRESHOLDS = {
     "cpu_percent": 80.0,
     "memory_percent": 85.0,
     "disk_percent": 90.0
 }
 
+# Alerts checked each cycle: (alert_id, threshold/metric key, alert title)
+ALERT_SPECS = (
+    ("cpu_high", "cpu_percent", "🚨 ALERT: High CPU Usage"),
+    ("memory_high", "memory_percent", "🚨 ALERT: High Memory Usage"),
+    ("disk_high", "disk_percent", "🚨 ALERT: High Disk Usage")
+)
+
+# System information that does not change for the lifetime of the process
+STATIC_SYSTEM_INFO = {
+    "platform": platform.platform(),
+    "python_version": platform.python_version(),
+    "hostname": platform.node(),
+    "cpu_count": psutil.cpu_count(logical=True),
+    "physical_cpu_count": psutil.cpu_count(logical=False),
+    "boot_time": datetime.fromtimestamp(psutil.boot_time()).isoformat()
+}
+
 class MonitoringApp:
     """Main monitoring application class."""
     
     def __init__(self):
         """Initialize the application."""
         self.start_time = time.time()
-        self.metrics_history = []
+        self.metrics_history = deque(maxlen=MAX_HISTORY)
+        
+        # Sliding windows with running sums for report averages
+        self._cpu_window = deque(maxlen=AVERAGE_WINDOW)
+        self._mem_window = deque(maxlen=AVERAGE_WINDOW)
+        self._cpu_sum = 0.0
+        self._mem_sum = 0.0
         self.active_alerts = set()
         self.last_report_time = 0
         
+        # Command name -> handler coroutine
+        self._handlers = {
+            "get_metrics": self._cmd_get_metrics,
+            "get_history": self._cmd_get_history,
+            "set_threshold": self._cmd_set_threshold,
+            "restart": self._cmd_restart
+        }
+        
+        # Prime the CPU counter so later non-blocking samples have a baseline
+        psutil.cpu_percent(interval=None)
+        
         # Initialize Grandmaster client
         self.client = GrandmasterClient(
             url=os.environ.get("GRANDMASTER_URL"),
@@ -67,43 +104,45 @@ class MonitoringApp:
         logger.info(f"Received: {message}")
         
         # Check if this is a command message
-        if isinstance(message, dict) and "command" in message:
+        if isinstance(message, Command):
             await self.handle_command(message)
     
     async def handle_command(self, message):
         """Handle command messages from Grandmaster."""
-        command = message["command"]
-        
-        if command == "get_metrics":
-            # Send immediate metrics report
-            await self.send_current_metrics()
-        
-        elif command == "get_history":
-            # Send metrics history
-            count = int(message.get("count", 10))
-            await self.client.send("Metrics History", {
-                "type": "metrics_history",
-                "data": self.metrics_history[-count:],
-                "count": min(count, len(self.metrics_history))
+        handler = self._handlers.get(message.command)
+        if handler:
+            await handler(message)
+    
+    async def _cmd_get_metrics(self, message):
+        """Send an immediate metrics report."""
+        await self.send_current_metrics()
+    
+    async def _cmd_get_history(self, message):
+        """Send the metrics history."""
+        count = int(message.get("count", 10))
+        history = self.metrics_history
+        await self.client.send("Metrics History", {
+            "type": "metrics_history",
+            "data": list(islice(history, max(0, len(history) - count), None)),
+            "count": min(count, len(self.metrics_history))
+        })
+    
+    async def _cmd_set_threshold(self, message):
+        """Update alert thresholds."""
+        if "thresholds" in message:
+            ALERT_THRESHOLDS.update(message["thresholds"])
+            logger.info(f"Updated thresholds: {ALERT_THRESHOLDS}")
+            await self.client.send("Thresholds Updated", {
+                "success": True,
+                "thresholds": ALERT_THRESHOLDS
             })
-        
-        elif command == "set_threshold":
-            # Update alert thresholds
-            if "thresholds" in message:
-                global ALERT_THRESHOLDS
-                ALERT_THRESHOLDS.update(message["thresholds"])
-                logger.info(f"Updated thresholds: {ALERT_THRESHOLDS}")
-                await self.client.send("Thresholds Updated", {
-                    "success": True,
-                    "thresholds": ALERT_THRESHOLDS
-                })
-        
-        elif command == "restart":
-            # Simulate restart
-            logger.info("Restart command received")
-            await self.client.send("Restarting", {"status": "restarting"})
-            # In a real app, you might do:
-            # os._exit(0)  # Exit and let Docker restart the container
+    
+    async def _cmd_restart(self, message):
+        """Simulate a restart."""
+        logger.info("Restart command received")
+        await self.client.send("Restarting", {"status": "restarting"})
+        # In a real app, you might do:
+        # os._exit(0)  # Exit and let Docker restart the container
     
     def on_error(self, error):
         """Handle connection errors."""
@@ -116,14 +155,9 @@ class MonitoringApp:
     async def send_system_info(self):
         """Send system information to Grandmaster."""
         info = {
-            "platform": platform.platform(),
-            "python_version": platform.python_version(),
-            "hostname": platform.node(),
-            "cpu_count": psutil.cpu_count(logical=True),
-            "physical_cpu_count": psutil.cpu_count(logical=False),
+            **STATIC_SYSTEM_INFO,
             "memory_total_gb": round(psutil.virtual_memory().total / (1024 ** 3), 2),
-            "disk_total_gb": round(psutil.disk_usage('/').total / (1024 ** 3), 2),
-            "boot_time": datetime.fromtimestamp(psutil.boot_time()).isoformat()
+            "disk_total_gb": round(psutil.disk_usage('/').total / (1024 ** 3), 2)
         }
         
         await self.client.send("System Information", {
@@ -138,13 +172,12 @@ class MonitoringApp:
         
         while self.client.connected:
             try:
-                # Collect metrics
-                metrics = self.collect_metrics()
+                # Collect metrics off the event loop (psutil issues blocking syscalls)
+                metrics = await asyncio.to_thread(self.collect_metrics)
                 
-                # Store in history
+                # Store in history (the deque evicts the oldest entry itself)
                 self.metrics_history.append(metrics)
-                if len(self.metrics_history) > MAX_HISTORY:
-                    self.metrics_history = self.metrics_history[-MAX_HISTORY:]
+                self._update_averages(metrics)
                 
                 # Check for alerts
                 await self.check_alerts(metrics)
@@ -161,10 +194,25 @@ class MonitoringApp:
             # Wait for next collection interval
             await asyncio.sleep(METRICS_INTERVAL)
     
+    def _update_averages(self, metrics):
+        """Push a sample into the averaging windows, keeping the sums current."""
+        cpu = metrics["cpu_percent"]
+        mem = metrics["memory"]["percent"]
+        
+        if len(self._cpu_window) == AVERAGE_WINDOW:
+            self._cpu_sum -= self._cpu_window[0]
+            self._mem_sum -= self._mem_window[0]
+        
+        self._cpu_window.append(cpu)
+        self._mem_window.append(mem)
+        self._cpu_sum += cpu
+        self._mem_sum += mem
+    
     def collect_metrics(self):
         """Collect current system metrics."""
         # Get basic metrics
-        cpu = psutil.cpu_percent(interval=1)
+        # Non-blocking: measures usage since the previous call (one metrics interval)
+        cpu = psutil.cpu_percent(interval=None)
         memory = psutil.virtual_memory()
         disk = psutil.disk_usage('/')
         
@@ -177,7 +225,7 @@ class MonitoringApp:
         # Build metrics object
         return {
             "timestamp": time.time(),
-            "isotime": datetime.now().isoformat(),
+            "isotime": iso_timestamp(),
             "cpu_percent": cpu,
             "memory": {
                 "percent": memory.percent,
@@ -201,49 +249,30 @@ class MonitoringApp:
     
     async def check_alerts(self, metrics):
         """Check metrics against thresholds and send alerts if needed."""
+        thresholds = ALERT_THRESHOLDS
+        active = self.active_alerts
         new_alerts = set()
         
-        # CPU alert
-        if metrics["cpu_percent"] > ALERT_THRESHOLDS["cpu_percent"]:
-            alert_id = f"cpu_high"
-            new_alerts.add(alert_id)
-            if alert_id not in self.active_alerts:
-                await self.client.send("🚨 ALERT: High CPU Usage", {
-                    "type": "alert",
-                    "alert_id": alert_id,
-                    "severity": "warning",
-                    "value": metrics["cpu_percent"],
-                    "threshold": ALERT_THRESHOLDS["cpu_percent"]
-                })
-                self.active_alerts.add(alert_id)
-        
-        # Memory alert
-        if metrics["memory"]["percent"] > ALERT_THRESHOLDS["memory_percent"]:
-            alert_id = f"memory_high"
-            new_alerts.add(alert_id)
-            if alert_id not in self.active_alerts:
-                await self.client.send("🚨 ALERT: High Memory Usage", {
-                    "type": "alert",
-                    "alert_id": alert_id,
-                    "severity": "warning",
-                    "value": metrics["memory"]["percent"],
-                    "threshold": ALERT_THRESHOLDS["memory_percent"]
-                })
-                self.active_alerts.add(alert_id)
+        # Flatten the watched values once instead of walking nested dicts per alert
+        values = {
+            "cpu_percent": metrics["cpu_percent"],
+            "memory_percent": metrics["memory"]["percent"],
+            "disk_percent": metrics["disk"]["percent"]
+        }
         
-        # Disk alert
-        if metrics["disk"]["percent"] > ALERT_THRESHOLDS["disk_percent"]:
-            alert_id = f"disk_high"
-            new_alerts.add(alert_id)
-            if alert_id not in self.active_alerts:
-                await self.client.send("🚨 ALERT: High Disk Usage", {
-                    "type": "alert",
-                    "alert_id": alert_id,
-                    "severity": "warning",
-                    "value": metrics["disk"]["percent"],
-                    "threshold": ALERT_THRESHOLDS["disk_percent"]
-                })
-                self.active_alerts.add(alert_id)
+        for alert_id, key, title in ALERT_SPECS:
+            value = values[key]
+            if value > thresholds[key]:
+                new_alerts.add(alert_id)
+                if alert_id not in active:
+                    await self.client.send(title, {
+                        "type": "alert",
+                        "alert_id": alert_id,
+                        "severity": "warning",
+                        "value": value,
+                        "threshold": thresholds[key]
+                    })
+                    active.add(alert_id)
         
         # Clear resolved alerts
         resolved_alerts = self.active_alerts - new_alerts
@@ -256,7 +285,7 @@ class MonitoringApp:
     
     async def send_current_metrics(self):
         """Send current metrics immediately."""
-        metrics = self.collect_metrics()
+        metrics = await asyncio.to_thread(self.collect_metrics)
         await self.client.send("Current Metrics", {
             "type": "metrics",
             "data": metrics
@@ -271,10 +300,10 @@ class MonitoringApp:
         # Get current metrics
         current = self.metrics_history[-1]
         
-        # Calculate averages from recent history
-        recent = self.metrics_history[-6:]  # Last 30 seconds (assuming 5-second intervals)
-        avg_cpu = sum(m["cpu_percent"] for m in recent) / len(recent)
-        avg_memory = sum(m["memory"]["percent"] for m in recent) / len(recent)
+        # Averages over the last AVERAGE_WINDOW samples, from the running sums
+        samples = len(self._cpu_window)
+        avg_cpu = self._cpu_sum / samples
+        avg_memory = self._mem_sum / samples
         
         # Send report
         await self.client.send("System Metrics Report", {
@@ -283,7 +312,7 @@ class MonitoringApp:
             "averages": {
                 "cpu_percent": round(avg_cpu, 1),
                 "memory_percent": round(avg_memory, 1),
-                "measurement_period_seconds": len(recent) * METRICS_INTERVAL
+                "measurement_period_seconds": samples * METRICS_INTERVAL
             },
             "system_status": "healthy" if not self.active_alerts else "warning"
         })
@@ -3,10 +3,21 @@ Configuration module for Grandmaster.
 Handles application configurations and environment settings.
 """
 
+import copy
+import functools
 import os
 import json
+import re
+import shlex
+import tempfile
 import logging
-from typing import Dict, Any, Optional
+import mmap
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Get base directory (container's working directory)
 BASE_DIR = os.environ.get("GRANDMASTER_BASE_DIR", os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -18,6 +29,15 @@ EXAMPLES_DIR = os.path.join(BASE_DIR, "examples")
 # Ensure config directory exists
 os.makedirs(CONFIG_DIR, exist_ok=True)
 
+# Config files larger than this are parsed straight from a memory map
+MMAP_THRESHOLD = 1024 * 1024
+
+# Append-only log of config changes made since apps.json was last written
+JOURNAL_FILE = os.path.join(CONFIG_DIR, "apps.log")
+
+# Number of journaled changes after which apps.json is rewritten and the journal cleared
+JOURNAL_COMPACT_INTERVAL = 100
+
 # Example applications paths
 APP_PATHS = {
     "js-simple-app": os.path.join(EXAMPLES_DIR, "js-simple-app"),
@@ -29,8 +49,8 @@ DEFAULT_CONFIG: Dict[str, Dict[str, Any]] = {
     "js-simple-app": {
         "name": "JavaScript Simple App",
         "description": "A simple JS application that connects to Grandmaster",
-        "start_cmd": "docker-compose up -d js-simple-app",
-        "stop_cmd": "docker-compose stop js-simple-app",
+        "start_cmd": ["docker-compose", "up", "-d", "js-simple-app"],
+        "stop_cmd": ["docker-compose", "stop", "js-simple-app"],
         "working_dir": BASE_DIR,
         "auto_start": True,
         "status": "stopped",  # Initial status
@@ -40,8 +60,8 @@ DEFAULT_CONFIG: Dict[str, Dict[str, Any]] = {
     "py-monitor-app": {
         "name": "Python Monitoring App",
         "description": "A Python monitoring application that reports system metrics",
-        "start_cmd": "docker-compose up -d py-monitor-app",
-        "stop_cmd": "docker-compose stop py-monitor-app",
+        "start_cmd": ["docker-compose", "up", "-d", "py-monitor-app"],
+        "stop_cmd": ["docker-compose", "stop", "py-monitor-app"],
         "working_dir": BASE_DIR,
         "auto_start": True,
         "status": "stopped",  # Initial status
@@ -63,6 +83,105 @@ def get_env(key: str, default: Optional[Any] = None) -> Any:
     """
     return os.environ.get(key, default)
 
+@functools.cache
+def is_container() -> bool:
+    """
+    Check whether Grandmaster is running inside a container.
+    
+    Returns:
+        True if a Docker or Podman marker file is present
+    """
+    return os.path.exists('/.dockerenv') or os.path.exists('/run/.containerenv')
+
+# Characters only a shell understands outside quotes: operators, expansions and globs,
+# the expansions it still performs inside double quotes, and a leading VAR=value assignment
+_SHELL_OPERATORS = frozenset("|&;<>()$`*?[]\n")
+_DQUOTE_EXPANSIONS = frozenset("$`")
+_ASSIGNMENT = re.compile(r"\w+=")
+
+def _uses_shell_syntax(cmd: str) -> bool:
+    """
+    Check whether a command string relies on the shell, ignoring quoted text.
+    
+    Args:
+        cmd: The command string
+        
+    Returns:
+        True if it uses unquoted shell syntax or starts with a VAR=value prefix
+    """
+    quote = None
+    escaped = False
+    word_start = True
+    for char in cmd:
+        if escaped:
+            escaped = False
+        elif quote == "'":
+            if char == "'":
+                quote = None
+        elif char == "\\":
+            escaped = True
+        elif quote == '"':
+            if char == '"':
+                quote = None
+            elif char in _DQUOTE_EXPANSIONS:
+                return True
+        elif char in "'\"":
+            quote = char
+        elif char in _SHELL_OPERATORS or (char == "~" and word_start):
+            return True
+        word_start = quote is None and not escaped and char.isspace()
+    
+    try:
+        tokens = shlex.split(cmd)
+    except ValueError:
+        # Unbalanced quotes; tokenizing reports the error
+        return False
+    return bool(tokens) and _ASSIGNMENT.match(tokens[0]) is not None
+
+def to_argv(cmd: Union[str, List[str]]) -> List[str]:
+    """
+    Tokenize a command string into an argv list.
+    
+    Args:
+        cmd: Command as a string or an argv list
+        
+    Returns:
+        The command as an argv list
+    """
+    return shlex.split(cmd) if isinstance(cmd, str) else cmd
+
+def prepare_commands(app_config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Store an app's start and stop commands as argv lists so spawning never re-parses them.
+    
+    Shell commands are left as strings for the shell to interpret.
+    
+    Args:
+        app_config: The application configuration, updated in place
+        
+    Returns:
+        The same application configuration
+    """
+    # Older configs ran every string command through the shell; keep that for
+    # commands that rely on it unless the app says otherwise
+    if "shell" not in app_config:
+        shell_cmds = [
+            key for key in ("start_cmd", "stop_cmd")
+            if isinstance(app_config.get(key), str) and _uses_shell_syntax(app_config[key])
+        ]
+        if shell_cmds:
+            logging.getLogger('grandmaster.config').warning(
+                f"App {app_config.get('name', '?')}: {', '.join(shell_cmds)} uses shell syntax, "
+                f"running it through the shell; set \"shell\" explicitly to silence this"
+            )
+            app_config["shell"] = True
+    
+    if not app_config.get("shell", False):
+        for key in ("start_cmd", "stop_cmd"):
+            if key in app_config:
+                app_config[key] = to_argv(app_config[key])
+    return app_config
+
 def get_config_path() -> Optional[str]:
     """
     Get the path to the custom config file.
@@ -75,40 +194,204 @@ def get_config_path() -> Optional[str]:
         return config_file
     return None
 
-def load_configs() -> Dict[str, Dict[str, Any]]:
+def _read_json(path: str) -> Any:
+    """
+    Parse a JSON file from its raw bytes.
+    
+    Args:
+        path: Path to the JSON file
+        
+    Returns:
+        The parsed JSON document
+    """
+    with open(path, 'rb') as file:
+        if orjson is None:
+            return json.loads(file.read())
+        
+        if os.fstat(file.fileno()).st_size > MMAP_THRESHOLD:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                return orjson.loads(view)
+        
+        return orjson.loads(file.read())
+
+def _dump_json(data: Any) -> bytes:
+    """
+    Serialize data to indented JSON bytes.
+    
+    Args:
+        data: The data to serialize
+        
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is None:
+        return json.dumps(data, indent=2).encode()
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+
+def load_configs() -> Tuple[Dict[str, Dict[str, Any]], int]:
     """
     Load application configurations from config file or use defaults.
     
     Returns:
-        Dictionary of application configurations
+        Dictionary of application configurations, and the number of journal
+        records replayed on top of the snapshot
     """
     logger = logging.getLogger('grandmaster.config')
     config_path = get_config_path()
     
-    # Start with default config
-    merged_config = DEFAULT_CONFIG.copy()
+    # Start with a deep copy of the defaults so merging, or later edits to nested
+    # argv lists and env dicts, never mutate DEFAULT_CONFIG
+    merged_config = copy.deepcopy(DEFAULT_CONFIG)
     
     # If custom config exists, merge it with defaults
     if config_path:
         try:
-            with open(config_path, 'r') as file:
-                logger.info(f"Loading app configurations from {config_path}")
-                custom_config = json.load(file)
-                
-                # Merge with defaults (custom config takes precedence)
-                for app_name, app_config in custom_config.items():
-                    if app_name in merged_config:
-                        merged_config[app_name].update(app_config)
-                    else:
-                        merged_config[app_name] = app_config
-                
-                logger.info(f"Loaded {len(custom_config)} custom app configurations")
+            logger.info(f"Loading app configurations from {config_path}")
+            custom_config = _read_json(config_path)
+            
+            # Merge with defaults (custom config takes precedence)
+            for app_name, app_config in custom_config.items():
+                if app_name in merged_config:
+                    merged_config[app_name].update(app_config)
+                else:
+                    merged_config[app_name] = app_config
+            
+            logger.info(f"Loaded {len(custom_config)} custom app configurations")
         except Exception as e:
             logger.error(f"Failed to load custom config: {e}")
     else:
         logger.info(f"Using default app configurations ({len(DEFAULT_CONFIG)} apps)")
     
-    return merged_config
+    # Apply changes recorded since the last snapshot
+    replayed = _replay_journal(merged_config)
+    if replayed:
+        logger.info(f"Replayed {replayed} journaled config changes")
+    
+    for app_name, app_config in merged_config.items():
+        try:
+            prepare_commands(app_config)
+        except ValueError as e:
+            logger.error(f"Invalid command for app {app_name}: {e}")
+    
+    return merged_config, replayed
+
+# fdatasync skips flushing file metadata where the platform provides it
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
+def encode_op(op: Dict[str, Any]) -> bytes:
+    """
+    Serialize a config change as one journal line.
+    
+    Args:
+        op: The change record; "op" is one of "status", "register" or "unregister"
+        
+    Returns:
+        The newline-terminated record
+    """
+    if orjson is None:
+        return (json.dumps(op) + "\n").encode()
+    return orjson.dumps(op, option=orjson.OPT_APPEND_NEWLINE)
+
+def append_journal(record: bytes) -> bool:
+    """
+    Append an encoded record to the journal and flush it to disk.
+    
+    Args:
+        record: A line produced by encode_op
+        
+    Returns:
+        True if the record was written, False otherwise
+    """
+    logger = logging.getLogger('grandmaster.config')
+    
+    try:
+        with open(JOURNAL_FILE, 'ab') as file:
+            file.write(record)
+            file.flush()
+            _fdatasync(file.fileno())
+        return True
+    except Exception as e:
+        logger.error(f"Failed to journal config change: {e}")
+        return False
+
+def append_op(op: Dict[str, Any]) -> bool:
+    """
+    Append a config change to the journal and flush it to disk.
+    
+    Args:
+        op: The change record; "op" is one of "status", "register" or "unregister"
+        
+    Returns:
+        True if the record was written, False otherwise
+    """
+    return append_journal(encode_op(op))
+
+def _is_valid_op(op: Any) -> bool:
+    """
+    Check that a parsed journal record has the fields its op needs.
+    
+    Args:
+        op: The parsed record
+        
+    Returns:
+        True if the record can be replayed
+    """
+    if not isinstance(op, dict) or not isinstance(op.get("name"), str):
+        return False
+    
+    kind = op.get("op")
+    if kind == "register":
+        return isinstance(op.get("config"), dict)
+    if kind == "status":
+        return isinstance(op.get("status"), str)
+    return kind == "unregister"
+
+def _replay_journal(configs: Dict[str, Dict[str, Any]]) -> int:
+    """
+    Apply journaled changes to the configurations in place.
+    
+    Every op sets state rather than adjusting it, so replaying records that
+    already made it into apps.json is harmless.
+    
+    Args:
+        configs: Dictionary of application configurations
+        
+    Returns:
+        Number of records applied
+    """
+    logger = logging.getLogger('grandmaster.config')
+    if not os.path.exists(JOURNAL_FILE):
+        return 0
+    
+    applied = 0
+    loads = json.loads if orjson is None else orjson.loads
+    with open(JOURNAL_FILE, 'rb') as file:
+        for line in file:
+            try:
+                op = loads(line)
+            except json.JSONDecodeError:
+                # A torn final line from a crash mid-write
+                logger.warning("Skipping unreadable config journal record")
+                continue
+            
+            # Valid JSON can still be a malformed record
+            if not _is_valid_op(op):
+                logger.warning(f"Skipping malformed config journal record: {line[:200]!r}")
+                continue
+            
+            app_name = op["name"]
+            if op["op"] == "register":
+                configs[app_name] = op["config"]
+            elif op["op"] == "unregister":
+                configs.pop(app_name, None)
+            elif app_name in configs:
+                configs[app_name]["status"] = op["status"]
+            else:
+                # Status change for an app that has since been removed
+                continue
+            applied += 1
+    
+    return applied
 
 def save_configs(configs: Dict[str, Dict[str, Any]]) -> bool:
     """
@@ -117,6 +400,33 @@ def save_configs(configs: Dict[str, Dict[str, Any]]) -> bool:
     Args:
         configs: Dictionary of application configurations
         
+    Returns:
+        True if saved successfully, False otherwise
+    """
+    return write_configs(dump_configs(configs))
+
+def dump_configs(configs: Dict[str, Dict[str, Any]]) -> bytes:
+    """
+    Serialize application configurations for write_configs.
+    
+    Args:
+        configs: Dictionary of application configurations
+        
+    Returns:
+        UTF-8 encoded JSON
+    """
+    return _dump_json(configs)
+
+def write_configs(data: bytes) -> bool:
+    """
+    Atomically replace apps.json with serialized configurations and clear the journal.
+    
+    The data goes to a temporary file that is flushed to disk and renamed over
+    apps.json, so a crash mid-write never leaves a truncated snapshot.
+    
+    Args:
+        data: Output of dump_configs
+        
     Returns:
         True if saved successfully, False otherwise
     """
@@ -127,9 +437,21 @@ def save_configs(configs: Dict[str, Dict[str, Any]]) -> bool:
         # Ensure config directory exists
         os.makedirs(os.path.dirname(config_file), exist_ok=True)
         
-        # Write config to file
-        with open(config_file, 'w') as file:
-            json.dump(configs, file, indent=2)
+        # Write config to a temporary file, then swap it in
+        fd, temp_path = tempfile.mkstemp(dir=CONFIG_DIR, prefix=".apps.", suffix=".json")
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(data)
+                file.flush()
+                _fdatasync(file.fileno())
+            os.replace(temp_path, config_file)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        
+        # The snapshot now holds every journaled change
+        if os.path.exists(JOURNAL_FILE):
+            os.remove(JOURNAL_FILE)
             
         logger.info(f"Saved app configurations to {config_file}")
         return True
@@ -6,35 +6,55 @@ Serves as the central hub for managing applications and communication.
 import asyncio
 import logging
 import os
+import shlex
+import shutil
 import signal
-import sys
 import time
-import json
-import subprocess
-from typing import Dict, List, Any, Optional, Callable, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple, Union
 
 from dotenv import load_dotenv
 
 from .telegram_client import TelegramClient
 from .websocket_server import WebSocketServer
-from .utils import setup_logging, format_timedelta, safe_execute_shell_cmd
-from .config import load_configs, save_configs, get_env
+from .utils import setup_logging, format_timedelta
+from .config import (
+    load_configs, dump_configs, write_configs, encode_op, append_journal,
+    get_env, is_container, prepare_commands, to_argv, JOURNAL_COMPACT_INTERVAL
+)
+
+# Pause between stop and start on restart when there is no process handle to wait on
+RESTART_GRACE_PERIOD = 0.5
+# Maximum time to wait for a stopped app's process to exit, or for notifications to flush
+EXIT_WAIT_TIMEOUT = 2.0
+# Time a daemon app gets to exit after SIGTERM before falling back to its stop command
+TERMINATE_TIMEOUT = 10.0
+# Time a daemon app must stay up after spawning to count as started
+DAEMON_STARTUP_TIMEOUT = 2.0
+# Bytes of a failed daemon's stderr to include in the error report
+STDERR_REPORT_LIMIT = 4096
 
 
 class Grandmaster:
     """
     Grandmaster class that orchestrates all components and serves as the central hub.
     """
+    
+    # The .env file is parsed once per process, however many instances are created
+    _env_loaded = False
 
-    def __init__(self, config_path: str = ".env"):
+    def __init__(self, config_path: str = ".env", shutdown_event: Optional[asyncio.Event] = None):
         """
         Initialize the Grandmaster instance.
         
         Args:
             config_path: Path to the configuration file
+            shutdown_event: Event to set on SIGINT/SIGTERM; one is created if omitted
         """
         # Load environment variables
-        load_dotenv(config_path)
+        if not Grandmaster._env_loaded:
+            load_dotenv(config_path)
+            Grandmaster._env_loaded = True
         
         # Setup logging
         self.logger = setup_logging(os.getenv("LOG_LEVEL", "INFO"))
@@ -45,20 +65,54 @@ class Grandmaster:
         self.websocket_server = WebSocketServer(self)
         
         # Load apps configuration
-        self.app_configs = load_configs()
+        # Records already in the journal count toward the next compaction
+        self.app_configs, self._journaled_ops = load_configs()
+        
+        # Apps to start on boot, kept in step with register/unregister
+        self._autostart_names: List[str] = [
+            name for name, config in self.app_configs.items() if config.get("auto_start", False)
+        ]
+        
+        # Config writes and fsyncs run off the event loop, one at a time and in order
+        self._config_io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="config-io")
         
         # Track running apps and their status
         self.running_apps = {}
         self.start_time = time.time()
         
+        # Set when a termination signal asks the service to shut down
+        self.shutdown_event = shutdown_event or asyncio.Event()
+        
+        # Merged process environment per app, built on first spawn
+        self._env_cache: Dict[str, Dict[str, str]] = {}
+        
+        # Resolved (command, working dir) per app and command key, built on first spawn
+        self._command_cache: Dict[Tuple[str, str], Tuple[Union[str, List[str]], str]] = {}
+        
+        # Cap on app start/stop commands running at once during bulk operations
+        max_spawns = int(get_env("GRANDMASTER_CONCURRENT_SPAWNS", min(8, os.cpu_count() or 1)))
+        self._spawn_semaphore = asyncio.Semaphore(max_spawns)
+        
         # Load runtime configuration
-        self.container_mode = os.path.exists('/.dockerenv')
+        self.container_mode = is_container()
         self.logger.info(f"Running in container mode: {self.container_mode}")
         
     async def start(self):
         """Start all components and autostart configured applications."""
         self.logger.info("Starting Grandmaster...")
         
+        # main.py runs on uvloop when available; record which loop we ended up on
+        loop = asyncio.get_running_loop()
+        self.logger.info(f"Event loop: {type(loop).__module__}.{type(loop).__name__}")
+        
+        # Route SIGINT/SIGTERM through the event loop
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self._handle_signal, sig)
+            except NotImplementedError:
+                # Windows event loops don't support signal handlers; KeyboardInterrupt still applies
+                pass
+        
         # Start the WebSocket server first
         try:
             await self.websocket_server.start()
@@ -88,7 +142,7 @@ class Grandmaster:
         # First stop all running applications
         stop_tasks = []
         for app_name in list(self.running_apps.keys()):
-            stop_tasks.append(self.stop_app(app_name))
+            stop_tasks.append(self._bounded(self.stop_app(app_name)))
         
         if stop_tasks:
             self.logger.info(f"Stopping {len(stop_tasks)} running applications")
@@ -100,8 +154,12 @@ class Grandmaster:
         except Exception as e:
             self.logger.error(f"Error stopping WebSocket server: {e}")
         
-        # Send shutdown notification
+        # Queue the shutdown notification behind pending ones and let them all go out
         await self.send_message("❄️ Grandmaster has gone cold ❄️", "bunker")
+        try:
+            await asyncio.wait_for(self.telegram.flush(), timeout=EXIT_WAIT_TIMEOUT)
+        except asyncio.TimeoutError:
+            self.logger.warning("Timed out waiting for Telegram notifications to flush")
         
         # Finally stop Telegram
         try:
@@ -109,22 +167,44 @@ class Grandmaster:
         except Exception as e:
             self.logger.error(f"Error stopping Telegram client: {e}")
         
+        # Fold the journal into a fresh snapshot
+        if self._journaled_ops:
+            await self._write_snapshot()
+        self._config_io.shutdown(wait=True)
+        
         self.logger.info("Grandmaster stopped successfully.")
 
+    def _handle_signal(self, sig: signal.Signals):
+        """
+        Handle a termination signal by requesting shutdown.
+        
+        The handlers are removed after the first signal so a second one gets the
+        default behaviour and can force-quit a slow shutdown.
+        """
+        self.logger.info(f"Received signal {sig.name}, shutting down (send again to force quit)...")
+        loop = asyncio.get_running_loop()
+        for handled in (signal.SIGINT, signal.SIGTERM):
+            loop.remove_signal_handler(handled)
+        self.shutdown_event.set()
+
     async def _autostart_apps(self):
         """Start apps that are configured to auto-start."""
         autostart_tasks = []
         
-        for app_name, config in self.app_configs.items():
-            if config.get("auto_start", False):
-                self.logger.info(f"Auto-starting app: {app_name}")
-                autostart_tasks.append(self.start_app(app_name))
+        for app_name in self._autostart_names:
+            self.logger.info(f"Auto-starting app: {app_name}")
+            autostart_tasks.append(self._bounded(self.start_app(app_name)))
         
         if autostart_tasks:
             results = await asyncio.gather(*autostart_tasks, return_exceptions=True)
             success_count = sum(1 for r in results if r is True)
             self.logger.info(f"Auto-started {success_count}/{len(autostart_tasks)} applications")
     
+    async def _bounded(self, coro):
+        """Await a coroutine while holding one of the concurrent spawn slots."""
+        async with self._spawn_semaphore:
+            return await coro
+    
     async def start_app(self, app_name: str) -> bool:
         """
         Start an application by name.
@@ -151,6 +231,10 @@ class Grandmaster:
             
             # Handle Docker and non-Docker apps differently
             app_type = app.get("type", "process")
+            runtime = {
+                "status": "running",
+                "type": app_type
+            }
             
             if app_type == "docker" and self.container_mode:
                 # In Docker mode, we use Docker Compose commands
@@ -159,21 +243,18 @@ class Grandmaster:
             else:
                 # Traditional process-based app
                 self.logger.info(f"Starting process app: {app_name}")
-                result = await self._start_process_app(app_name, app)
+                result = await self._start_process_app(app_name, app, runtime)
             
             if not result:
                 return False
             
             # Update app status
             self.app_configs[app_name]["status"] = "running"
-            self.running_apps[app_name] = {
-                "started_at": time.time(),
-                "status": "running",
-                "type": app_type
-            }
+            runtime["started_at"] = time.time()
+            self.running_apps[app_name] = runtime
             
-            # Save updated configuration
-            save_configs(self.app_configs)
+            # Record the status change
+            await self._journal({"op": "status", "name": app_name, "status": "running"})
             
             self.logger.info(f"App started successfully: {app_name}")
             await self.send_message(f"✅ App started: {app['name']}", "bunker")
@@ -188,15 +269,11 @@ class Grandmaster:
     async def _start_docker_app(self, app_name: str, app_config: Dict[str, Any]) -> bool:
         """Start a Docker-managed application."""
         try:
-            command = app_config["start_cmd"]
-            working_dir = app_config["working_dir"]
-            
             # Execute the command
-            result = await asyncio.to_thread(
-                safe_execute_shell_cmd,
-                command,
-                working_dir,
-                timeout=60
+            result = await self._run_cmd(
+                *self._command(app_name, app_config, "start_cmd"),
+                timeout=60,
+                shell=app_config.get("shell", False)
             )
             
             if not result['success']:
@@ -213,16 +290,45 @@ class Grandmaster:
             self.logger.error(f"Error starting Docker app {app_name}: {e}")
             return False
     
-    async def _start_process_app(self, app_name: str, app_config: Dict[str, Any]) -> bool:
-        """Start a process-based application."""
+    async def _start_process_app(self, app_name: str, app_config: Dict[str, Any], runtime: Dict[str, Any]) -> bool:
+        """
+        Start a process-based application.
+        
+        Daemon apps ("daemon": true) are the long-running process themselves:
+        the handle is kept in runtime["proc"] once the process has stayed up for
+        DAEMON_STARTUP_TIMEOUT, and its stderr is drained in the background.
+        Other apps run a start command to completion.
+        """
         try:
+            if app_config.get("daemon", False):
+                process = await self._spawn(
+                    *self._command(app_name, app_config, "start_cmd"),
+                    env=self._app_env(app_name, app_config),
+                    shell=app_config.get("shell", False),
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.PIPE
+                )
+                
+                # A daemon that exits straight away failed to start
+                try:
+                    await asyncio.wait_for(process.wait(), timeout=DAEMON_STARTUP_TIMEOUT)
+                except asyncio.TimeoutError:
+                    runtime["proc"] = process
+                    runtime["stderr_task"] = asyncio.create_task(self._drain_stderr(app_name, process))
+                    return True
+                
+                stderr = await process.stderr.read(STDERR_REPORT_LIMIT)
+                error_msg = stderr.decode(errors="replace").strip() or f"Exited with code {process.returncode}"
+                self.logger.error(f"App {app_name} exited during startup: {error_msg}")
+                await self.send_message(f"❌ Failed to start app: {app_config['name']}\n\n{error_msg}", "bunker")
+                return False
+            
             # Execute the start command
-            result = await asyncio.to_thread(
-                safe_execute_shell_cmd,
-                app_config["start_cmd"],
-                app_config["working_dir"],
+            result = await self._run_cmd(
+                *self._command(app_name, app_config, "start_cmd"),
+                env=self._app_env(app_name, app_config),
                 timeout=60,
-                env={**os.environ, **app_config.get("env", {})}
+                shell=app_config.get("shell", False)
             )
             
             if not result['success']:
@@ -275,11 +381,12 @@ class Grandmaster:
             
             # Update app status
             self.app_configs[app_name]["status"] = "stopped"
-            if app_name in self.running_apps:
-                del self.running_apps[app_name]
+            runtime = self.running_apps.pop(app_name, None)
+            if runtime and runtime.get("stderr_task"):
+                runtime["stderr_task"].cancel()
             
-            # Save updated configuration
-            save_configs(self.app_configs)
+            # Record the status change
+            await self._journal({"op": "status", "name": app_name, "status": "stopped"})
             
             self.logger.info(f"App stopped successfully: {app_name}")
             await self.send_message(f"✅ App stopped: {app['name']}", "bunker")
@@ -294,15 +401,11 @@ class Grandmaster:
     async def _stop_docker_app(self, app_name: str, app_config: Dict[str, Any]) -> bool:
         """Stop a Docker-managed application."""
         try:
-            command = app_config["stop_cmd"]
-            working_dir = app_config["working_dir"]
-            
             # Execute the command
-            result = await asyncio.to_thread(
-                safe_execute_shell_cmd,
-                command,
-                working_dir,
-                timeout=60
+            result = await self._run_cmd(
+                *self._command(app_name, app_config, "stop_cmd"),
+                timeout=60,
+                shell=app_config.get("shell", False)
             )
             
             if not result['success']:
@@ -322,12 +425,22 @@ class Grandmaster:
     async def _stop_process_app(self, app_name: str, app_config: Dict[str, Any]) -> bool:
         """Stop a process-based application."""
         try:
+            # Terminate daemon apps through their handle; the stop command is the fallback
+            process = self.running_apps.get(app_name, {}).get("proc")
+            if process is not None:
+                if await self._terminate(app_name, process):
+                    return True
+                if not app_config.get("stop_cmd"):
+                    process.kill()
+                    await process.wait()
+                    return True
+            
             # Execute the stop command
-            result = await asyncio.to_thread(
-                safe_execute_shell_cmd,
-                app_config["stop_cmd"],
-                app_config["working_dir"],
-                timeout=60
+            result = await self._run_cmd(
+                *self._command(app_name, app_config, "stop_cmd"),
+                env=self._app_env(app_name, app_config),
+                timeout=60,
+                shell=app_config.get("shell", False)
             )
             
             if not result['success']:
@@ -335,12 +448,197 @@ class Grandmaster:
                 self.logger.error(f"Failed to stop app {app_name}: {error_msg}")
                 await self.send_message(f"❌ Failed to stop app: {app_config['name']}\n\n{error_msg}", "bunker")
                 return False
+            
+            # The stop command should have ended a daemon that ignored SIGTERM; don't leave it behind
+            if process is not None and process.returncode is None:
+                try:
+                    await asyncio.wait_for(process.wait(), timeout=EXIT_WAIT_TIMEOUT)
+                except asyncio.TimeoutError:
+                    self.logger.warning(f"App {app_name} still running after its stop command, killing it")
+                    process.kill()
+                    await process.wait()
                 
             return True
         except Exception as e:
             self.logger.error(f"Error stopping process app {app_name}: {e}")
             return False
             
+    async def _terminate(self, app_name: str, process: asyncio.subprocess.Process) -> bool:
+        """
+        Send SIGTERM to an app process and wait for it to exit.
+        
+        Args:
+            app_name: The name of the application
+            process: The application's process handle
+            
+        Returns:
+            True if the process has exited, False if it is still running after the timeout
+        """
+        if process.returncode is not None:
+            return True
+        
+        try:
+            process.terminate()
+        except ProcessLookupError:
+            return True
+        
+        try:
+            await asyncio.wait_for(process.wait(), timeout=TERMINATE_TIMEOUT)
+            return True
+        except asyncio.TimeoutError:
+            self.logger.warning(f"App {app_name} did not exit within {TERMINATE_TIMEOUT}s of SIGTERM")
+            return False
+    
+    async def _drain_stderr(self, app_name: str, process: asyncio.subprocess.Process):
+        """
+        Read a daemon app's stderr until it closes so the pipe never fills up.
+        
+        Args:
+            app_name: The name of the application
+            process: The application's process handle
+        """
+        try:
+            async for line in process.stderr:
+                self.logger.debug(f"[{app_name}] {line.decode(errors='replace').rstrip()}")
+        except Exception as e:
+            self.logger.debug(f"Stopped reading stderr of app {app_name}: {e}")
+    
+    def _app_env(self, app_name: str, app_config: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Get the process environment for an app, merging os.environ with its env once.
+        
+        Args:
+            app_name: The name of the application
+            app_config: The application configuration
+            
+        Returns:
+            The merged environment
+        """
+        env = self._env_cache.get(app_name)
+        if env is None:
+            env = self._env_cache[app_name] = {**os.environ, **app_config.get("env", {})}
+        return env
+    
+    def _command(self, app_name: str, app_config: Dict[str, Any], key: str) -> Tuple[Union[str, List[str]], str]:
+        """
+        Get an app command with its executable and working directory resolved once.
+        
+        The executable is looked up on the app's PATH and the working directory
+        has its symlinks resolved, so later spawns skip both. The results live
+        only in memory; apps.json keeps the configured values.
+        
+        Args:
+            app_name: The name of the application
+            app_config: The application configuration
+            key: "start_cmd" or "stop_cmd"
+            
+        Returns:
+            Tuple of the command and the working directory
+        """
+        cached = self._command_cache.get((app_name, key))
+        if cached is not None:
+            return cached
+        
+        cmd = app_config[key]
+        if not app_config.get("shell", False):
+            argv = to_argv(cmd)
+            if argv:
+                path = self._app_env(app_name, app_config).get("PATH")
+                cmd = [shutil.which(argv[0], path=path) or argv[0], *argv[1:]]
+        
+        cached = self._command_cache[(app_name, key)] = (cmd, os.path.realpath(app_config["working_dir"]))
+        return cached
+    
+    def _forget_commands(self, app_name: str):
+        """Drop an app's resolved commands after its configuration changes."""
+        for key in ("start_cmd", "stop_cmd"):
+            self._command_cache.pop((app_name, key), None)
+    
+    async def _spawn(
+        self,
+        cmd: Union[str, List[str]],
+        cwd: str,
+        env: Optional[Dict[str, str]] = None,
+        shell: bool = False,
+        stdout: int = asyncio.subprocess.PIPE,
+        stderr: int = asyncio.subprocess.PIPE
+    ) -> asyncio.subprocess.Process:
+        """
+        Spawn a command as an asyncio subprocess.
+        
+        Args:
+            cmd: Command as an argv list or a string (tokenized unless shell is set)
+            cwd: Working directory for the command
+            env: Optional environment for the command
+            shell: Run the command through the shell
+            stdout: Where to send the command's stdout
+            stderr: Where to send the command's stderr
+            
+        Returns:
+            The process handle
+        """
+        if shell:
+            command = cmd if isinstance(cmd, str) else shlex.join(cmd)
+            return await asyncio.create_subprocess_shell(
+                command, cwd=cwd, env=env, stdout=stdout, stderr=stderr
+            )
+        
+        argv = to_argv(cmd)
+        if not argv:
+            raise ValueError("No command configured")
+        
+        return await asyncio.create_subprocess_exec(
+            *argv, cwd=cwd, env=env, stdout=stdout, stderr=stderr
+        )
+    
+    async def _run_cmd(
+        self,
+        cmd: Union[str, List[str]],
+        cwd: str,
+        env: Optional[Dict[str, str]] = None,
+        timeout: float = 60,
+        shell: bool = False,
+        capture_stdout: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Run a command to completion on the event loop.
+        
+        Args:
+            cmd: Command as an argv list or a string (tokenized unless shell is set)
+            cwd: Working directory for the command
+            env: Optional environment for the command
+            timeout: Seconds to wait before killing the command
+            shell: Run the command through the shell
+            capture_stdout: Collect stdout; otherwise it is discarded
+            
+        Returns:
+            Dictionary with success, returncode, stdout and stderr
+        """
+        stdout_target = asyncio.subprocess.PIPE if capture_stdout else asyncio.subprocess.DEVNULL
+        try:
+            process = await self._spawn(cmd, cwd, env=env, shell=shell, stdout=stdout_target)
+        except ValueError as e:
+            return {"success": False, "returncode": None, "stdout": "", "stderr": str(e)}
+        
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            return {
+                "success": False,
+                "returncode": None,
+                "stdout": "",
+                "stderr": f"Command timed out after {timeout}s"
+            }
+        
+        return {
+            "success": process.returncode == 0,
+            "returncode": process.returncode,
+            "stdout": stdout.decode(errors="replace") if stdout else "",
+            "stderr": stderr.decode(errors="replace")
+        }
+            
     async def restart_app(self, app_name: str) -> bool:
         """
         Restart an application by name.
@@ -354,14 +652,22 @@ class Grandmaster:
         self.logger.info(f"Restarting app: {app_name}")
         
         # Stop the app if it's running
+        process = None
         if app_name in self.running_apps:
+            process = self.running_apps[app_name].get("proc")
             stop_success = await self.stop_app(app_name)
             if not stop_success:
                 self.logger.warning(f"Failed to stop app {app_name} during restart")
                 # Continue anyway to try starting it
         
-        # Give it a moment to fully stop
-        await asyncio.sleep(2)
+        # Wait for the old process to exit, or give the stop a brief moment to settle
+        if process is not None:
+            try:
+                await asyncio.wait_for(process.wait(), timeout=EXIT_WAIT_TIMEOUT)
+            except asyncio.TimeoutError:
+                self.logger.warning(f"App {app_name} did not exit within {EXIT_WAIT_TIMEOUT}s")
+        else:
+            await asyncio.sleep(RESTART_GRACE_PERIOD)
         
         # Start the app
         return await self.start_app(app_name)
@@ -370,6 +676,9 @@ class Grandmaster:
         """
         Get the status of a specific app or all apps.
         
+        The app configuration is returned under "static" alongside the runtime
+        fields; callers wanting a flat dict can merge them.
+        
         Args:
             app_name: Optional app name to get status for
             
@@ -380,34 +689,30 @@ class Grandmaster:
             if app_name not in self.app_configs:
                 return {"error": f"App '{app_name}' not found"}
             
-            app_info = self.app_configs[app_name].copy()
+            return self._app_status(app_name, time.time())
+        
+        # Return status for all apps
+        now = time.time()
+        return {name: self._app_status(name, now) for name in self.app_configs}
+    
+    def _app_status(self, app_name: str, now: float) -> Dict[str, Any]:
+        """
+        Build the status entry for one app.
+        
+        Args:
+            app_name: The name of the application
+            now: Current time for the uptime calculation
             
-            # Add runtime information if the app is running
-            if app_name in self.running_apps:
-                app_info["running"] = True
-                app_info["uptime"] = format_timedelta(time.time() - self.running_apps[app_name]["started_at"])
-            else:
-                app_info["running"] = False
-                app_info["uptime"] = None
-                
-            return app_info
-        else:
-            # Return status for all apps
-            result = {}
-            for name, config in self.app_configs.items():
-                app_info = config.copy()
-                
-                # Add runtime information if the app is running
-                if name in self.running_apps:
-                    app_info["running"] = True
-                    app_info["uptime"] = format_timedelta(time.time() - self.running_apps[name]["started_at"])
-                else:
-                    app_info["running"] = False
-                    app_info["uptime"] = None
-                    
-                result[name] = app_info
-                
-            return result
+        Returns:
+            Dictionary with the static config and runtime information
+        """
+        runtime = self.running_apps.get(app_name)
+        # A copy, so callers adding display fields can't alter the stored config
+        return {
+            "static": dict(self.app_configs[app_name]),
+            "running": runtime is not None,
+            "uptime": format_timedelta(now - runtime["started_at"]) if runtime else None
+        }
     
     async def register_app(self, app_info: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -437,14 +742,28 @@ class Grandmaster:
             "auto_start": app_info.get("auto_start", False),
             "status": "stopped",
             "env": app_info.get("env", {}),
-            "type": app_info.get("type", "process")
+            "type": app_info.get("type", "process"),
+            "daemon": app_info.get("daemon", False)
         }
+        # Left unset, prepare_commands picks the shell for commands that need one
+        if "shell" in app_info:
+            app_config["shell"] = app_info["shell"]
+        
+        # Tokenize commands now rather than on every start/stop
+        try:
+            prepare_commands(app_config)
+        except ValueError as e:
+            return {"success": False, "error": f"Invalid command: {e}"}
         
         # Add to configurations
         self.app_configs[app_name] = app_config
+        self._env_cache.pop(app_name, None)
+        self._forget_commands(app_name)
+        if app_config["auto_start"]:
+            self._autostart_names.append(app_name)
         
-        # Save configurations
-        if save_configs(self.app_configs):
+        # Record the new app
+        if await self._journal({"op": "register", "name": app_name, "config": app_config}):
             self.logger.info(f"Registered new app: {app_name}")
             await self.send_message(f"➕ Registered new app: {app_config['name']}", "bunker")
             return {"success": True, "app": app_config}
@@ -472,34 +791,84 @@ class Grandmaster:
             
         # Remove from configurations
         app_config = self.app_configs.pop(app_name)
+        self._env_cache.pop(app_name, None)
+        self._forget_commands(app_name)
+        if app_name in self._autostart_names:
+            self._autostart_names.remove(app_name)
         
-        # Save configurations
-        if save_configs(self.app_configs):
+        # Record the removal
+        if await self._journal({"op": "unregister", "name": app_name}):
             self.logger.info(f"Unregistered app: {app_name}")
             await self.send_message(f"➖ Unregistered app: {app_config['name']}", "bunker")
             return {"success": True}
         else:
             # Restore app config
             self.app_configs[app_name] = app_config
+            if app_config.get("auto_start", False):
+                self._autostart_names.append(app_name)
             self.logger.error(f"Failed to save config after unregistering app: {app_name}")
             return {"success": False, "error": "Failed to save configuration"}
     
-    async def send_message(self, content: str, channel: str, media_type: Optional[str] = None, media_path: Optional[str] = None, parse_mode: Optional[str] = None):
+    async def _journal(self, op: Dict[str, Any]) -> bool:
+        """
+        Persist a config change, compacting the journal into apps.json periodically.
+        
+        Records are serialized on the event loop and written by the config I/O thread.
+        
+        Args:
+            op: The change record
+            
+        Returns:
+            True if the change was persisted, False otherwise
+        """
+        record = encode_op(op)
+        loop = asyncio.get_running_loop()
+        if not await loop.run_in_executor(self._config_io, append_journal, record):
+            return False
+        
+        self._journaled_ops += 1
+        if self._journaled_ops >= JOURNAL_COMPACT_INTERVAL and await self._write_snapshot():
+            self._journaled_ops = 0
+        return True
+    
+    async def _write_snapshot(self) -> bool:
+        """
+        Write all app configurations to apps.json, clearing the journal.
+        
+        Returns:
+            True if saved successfully, False otherwise
+        """
+        # Serialize here so the config thread never sees the dicts mid-update
+        data = dump_configs(self.app_configs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._config_io, write_configs, data)
+    
+    async def send_message(self, content: str, channel: str, media_type: Optional[str] = None, media_path: Optional[str] = None, parse_mode: Optional[str] = None, flush: bool = False):
         """
         Send a message to the specified Telegram channel.
         
+        Plain text messages are batched by the Telegram client unless flush
+        is set, and wait in the batch while Telegram is unreachable. Media and
+        formatted messages are dropped while the Telegram client is not ready.
+        
         Args:
             content: The message content
             channel: The channel to send to
             media_type: Optional media type
             media_path: Optional path to media file
             parse_mode: Optional parsing mode
+            flush: Send immediately instead of batching
             
         Returns:
-            Response from the Telegram API or None
+            Response from the Telegram API or None, or for batched messages a
+            future resolved with the response once the batch is sent
         """
+        # Only plain text can wait in the batcher for Telegram to come back
+        if not self.telegram.ready and (media_type or media_path or parse_mode):
+            return None
+        
         try:
-            return await self.telegram.send_message(content, channel, media_type, media_path, parse_mode)
+            return await self.telegram.send_message(content, channel, media_type, media_path, parse_mode, flush)
         except Exception as e:
             self.logger.error(f"Failed to send message to channel {channel}: {e}")
             return None
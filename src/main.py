@@ -5,7 +5,10 @@ import os
 import sys
 from typing import Optional
 
-from dotenv import load_dotenv
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 # Ensure the src package is in the path
 sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
@@ -15,18 +18,15 @@ from src.grandmaster import Grandmaster
 
 async def main(config_path: Optional[str] = None):
     """Main entry point for the Grandmaster application."""
-    # Load environment variables if config path is provided
-    if config_path:
-        load_dotenv(config_path)
-    
     # Create and start Grandmaster
+    grandmaster = None
+    shutdown_event = asyncio.Event()
     try:
-        grandmaster = Grandmaster(config_path)
+        grandmaster = Grandmaster(config_path, shutdown_event)
         await grandmaster.start()
         
-        # Keep the application running
-        while True:
-            await asyncio.sleep(1)
+        # Sleep until a termination signal sets the event; nothing wakes the loop meanwhile
+        await shutdown_event.wait()
     
     except KeyboardInterrupt:
         logging.info("Received keyboard interrupt, shutting down...")
@@ -37,7 +37,8 @@ async def main(config_path: Optional[str] = None):
     finally:
         # Ensure proper cleanup
         try:
-            await grandmaster.stop()
+            if grandmaster:
+                await grandmaster.stop()
         except Exception as e:
             logging.error(f"Error during shutdown: {str(e)}")
 
@@ -46,5 +47,9 @@ if __name__ == "__main__":
     # Get configuration path from command line arguments
     config_path = sys.argv[1] if len(sys.argv) > 1 else ".env"
     
-    # Run the main function
-    asyncio.run(main(config_path))
\ No newline at end of file
+    # Run the main function, on uvloop's faster event loop when available;
+    # uvloop.run creates the loop itself rather than changing the global policy
+    if uvloop is not None:
+        uvloop.run(main(config_path))
+    else:
+        asyncio.run(main(config_path))
\ No newline at end of file
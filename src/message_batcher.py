@@ -0,0 +1,196 @@
+"""
+Message batching module for Grandmaster.
+Coalesces text notifications sent in quick succession into one message per channel.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, Union
+
+# Telegram rejects text messages longer than this
+MAX_MESSAGE_LENGTH = 4096
+
+Channel = Union[str, int, None]
+
+
+class MessageBatcher:
+    """Collects text messages per channel and delivers each batch with a single send."""
+
+    def __init__(
+        self,
+        send_func: Callable[[str, Channel], Awaitable[Any]],
+        interval: float = 0.1,
+        ready: Optional[asyncio.Event] = None,
+        max_buffer_size: int = 0
+    ):
+        """
+        Initialize the message batcher.
+
+        Args:
+            send_func: Coroutine function delivering (content, channel)
+            interval: Seconds to keep collecting after the first queued message
+            ready: Optional event that must be set before a batch is sent;
+                   messages stay queued while it is clear
+            max_buffer_size: Maximum number of queued messages, 0 for no limit;
+                             the oldest are dropped to make room
+        """
+        self.send_func = send_func
+        self.interval = interval
+        self.ready = ready
+        self.max_buffer_size = max_buffer_size
+        self.logger = logging.getLogger('grandmaster.batcher')
+
+        # Messages waiting for the next batch; kept here rather than inside _run so
+        # flush() and stop() can always reach them
+        self._buffer: Deque[Tuple[Channel, str, asyncio.Future]] = deque()
+        self._has_items = asyncio.Event()
+        self._stopping = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._evicted = 0
+
+    def start(self):
+        """Start the background flush task."""
+        if self._task is None:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def flush(self):
+        """Deliver everything queued right away, after any batch already being sent."""
+        async with self._flush_lock:
+            if self.ready is None or self.ready.is_set():
+                await self._flush(self._drain())
+
+    async def stop(self):
+        """
+        Stop the flush task and deliver anything still queued, unless sending isn't ready.
+
+        The task finishes the batch it is sending before it exits; queued messages
+        that can't be delivered have their futures resolved with None.
+        """
+        if self._task:
+            self._stopping.set()
+            try:
+                await self._task
+            finally:
+                self._task = None
+
+        async with self._flush_lock:
+            items = self._drain()
+            if self.ready is None or self.ready.is_set():
+                await self._flush(items)
+                return
+
+            if items:
+                self.logger.warning(f"Dropping {len(items)} queued messages, sending is not ready")
+            for _, _, future in items:
+                if not future.done():
+                    future.set_result(None)
+
+    def add(self, content: str, channel: Channel) -> asyncio.Future:
+        """
+        Queue a message for the next batch.
+
+        Args:
+            content: The message text
+            channel: The channel to send to
+
+        Returns:
+            Future resolved with the send result once the batch is delivered
+        """
+        # Evict the oldest messages rather than buffer without bound while sending is stalled
+        while self.max_buffer_size and len(self._buffer) >= self.max_buffer_size:
+            _, _, evicted = self._buffer.popleft()
+            if not evicted.done():
+                evicted.set_result(None)
+            self._evicted += 1
+
+        future = asyncio.get_running_loop().create_future()
+        self._buffer.append((channel, content, future))
+        self._has_items.set()
+        return future
+
+    def _drain(self) -> List[Tuple[Channel, str, asyncio.Future]]:
+        """Take every message currently queued."""
+        items = list(self._buffer)
+        self._buffer.clear()
+        self._has_items.clear()
+        return items
+
+    async def _wait(self, event: asyncio.Event, timeout: Optional[float] = None):
+        """
+        Wait for an event, returning early if the batcher is stopping.
+
+        Args:
+            event: The event to wait for
+            timeout: Optional maximum number of seconds to wait
+        """
+        if event.is_set() or self._stopping.is_set():
+            return
+
+        waiters = [asyncio.create_task(event.wait()), asyncio.create_task(self._stopping.wait())]
+        try:
+            await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+
+    async def _run(self):
+        """Wait for a message, give others a moment to arrive, then flush them together."""
+        while True:
+            await self._wait(self._has_items)
+            if self._stopping.is_set():
+                return
+
+            # Collect for one interval; stop() cuts this short and flushes the rest itself
+            await self._wait(self._stopping, self.interval)
+            if self.ready is not None:
+                await self._wait(self.ready)
+            if self._stopping.is_set():
+                return
+
+            if self._evicted:
+                self.logger.warning(f"Dropped {self._evicted} messages that overflowed the batch buffer")
+                self._evicted = 0
+
+            async with self._flush_lock:
+                await self._flush(self._drain())
+
+    async def _flush(self, items: List[Tuple[Channel, str, asyncio.Future]]):
+        """
+        Deliver queued messages, joining those for the same channel.
+
+        Args:
+            items: Queued (channel, content, future) entries
+        """
+        batches: Dict[Channel, List[List[Tuple[str, asyncio.Future]]]] = {}
+        lengths: Dict[Channel, int] = {}
+
+        for channel, content, future in items:
+            channel_batches = batches.setdefault(channel, [[]])
+            # Start a new message rather than exceed Telegram's length limit
+            if channel_batches[-1] and lengths[channel] + 2 + len(content) > MAX_MESSAGE_LENGTH:
+                channel_batches.append([])
+                lengths[channel] = 0
+
+            lengths[channel] = lengths.get(channel, 0) + (2 if channel_batches[-1] else 0) + len(content)
+            channel_batches[-1].append((content, future))
+
+        try:
+            for channel, channel_batches in batches.items():
+                for batch in channel_batches:
+                    try:
+                        result = await self.send_func("\n\n".join(content for content, _ in batch), channel)
+                    except Exception as e:
+                        self.logger.error(f"Failed to send batched message to channel {channel}: {e}")
+                        result = None
+
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_result(result)
+        finally:
+            # Interrupted mid-delivery: fail whatever wasn't sent instead of leaving it pending
+            for _, _, future in items:
+                if not future.done():
+                    future.cancel()
@@ -1,12 +1,40 @@
 
+import asyncio
 import logging
 import os
+from pathlib import Path
 from typing import Dict, Any, Optional, Union, BinaryIO
 
 
-import traceback
-from telegram import Bot, Update
-from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
+from telegram import Bot, InputFile, Update
+from telegram.error import BadRequest, NetworkError, TimedOut
+from telegram.ext import AIORateLimiter, Application, CommandHandler, MessageHandler, filters, ContextTypes
+from telegram.request import HTTPXRequest
+
+from .message_batcher import MessageBatcher
+
+# Seconds to collect plain text messages before sending them as one, and the cap on queued messages
+DEFAULT_BATCH_INTERVAL = "1.0"
+DEFAULT_BATCH_MAX_BUFFER = "100"
+
+# Bot API request shaping: Telegram allows about 30 messages per second overall
+RATE_LIMIT_OVERALL_MAX_RATE = 30
+RATE_LIMIT_OVERALL_PERIOD = 1
+RATE_LIMIT_MAX_RETRIES = 3
+
+# HTTP/2 client for Bot API requests, pooled for handlers running concurrently;
+# writes get longer than reads since they carry media uploads
+BOT_CONNECTION_POOL_SIZE = 256
+BOT_POOL_TIMEOUT = 10.0
+BOT_READ_TIMEOUT = 20.0
+BOT_WRITE_TIMEOUT = 60.0
+
+# Plain text that isn't a command, built once for the fallback message handler
+_TEXT_NOCMD = filters.TEXT & ~filters.COMMAND
+
+# Backoff bounds, in seconds, between reconnection attempts after Telegram becomes unreachable
+RECONNECT_MIN_DELAY = 1.0
+RECONNECT_MAX_DELAY = 60.0
 
 
 class TelegramClient:
@@ -32,48 +60,163 @@ class TelegramClient:
 
         self.maester_channel_id = os.getenv("TELEGRAM_MAESTER_CHANNEL_ID") # Admin messages
         self.bunker_channel_id = os.getenv("TELEGRAM_BUNKER_CHANNEL_ID") # Logs and Debugging
+
+        # Channel name -> ID, resolved once rather than on every send
+        self._channel_map = {
+            "highborn": self.highborn_channel_id,
+            "townsquare": self.townsquare_channel_id,
+            "smallfolk": self.smallfolk_channel_id,
+            "raven": self.raven_channel_id,
+            "maester": self.maester_channel_id,
+            "bunker": self.bunker_channel_id,
+            "whispers": self.whispers_channel_id,  # Default channel
+        }
         
 
         # Initialize the Telegram bot
-        self.application = Application.builder().token(self.token).build()
+        # Requests are shaped client-side so bursts queue up instead of hitting flood limits.
+        # AIORateLimiter also applies Telegram's per-group limit to each chat on its own.
+        rate_limiter = AIORateLimiter(
+            overall_max_rate=RATE_LIMIT_OVERALL_MAX_RATE,
+            overall_time_period=RATE_LIMIT_OVERALL_PERIOD,
+            max_retries=RATE_LIMIT_MAX_RETRIES
+        )
+        # Bot API calls share multiplexed HTTP/2 connections instead of one socket per request
+        request = HTTPXRequest(
+            connection_pool_size=BOT_CONNECTION_POOL_SIZE,
+            pool_timeout=BOT_POOL_TIMEOUT,
+            read_timeout=BOT_READ_TIMEOUT,
+            write_timeout=BOT_WRITE_TIMEOUT,
+            http_version="2"
+        )
+
+        # Updates are handled concurrently so a slow handler can't hold up the rest;
+        # that needs a connection pool large enough for the handlers' requests
+        self.application = (
+            Application.builder()
+            .token(self.token)
+            .request(request)
+            .rate_limiter(rate_limiter)
+            .concurrent_updates(True)
+            .build()
+        )
         self.bot = self.application.bot
 
+        # Media type -> bot method, bound once
+        self._media_senders = {
+            "photo": self.bot.send_photo,
+            "video": self.bot.send_video,
+            "document": self.bot.send_document,
+            "audio": self.bot.send_audio,
+            "voice": self.bot.send_voice
+        }
+
+        # Set while no send is in flight, so shutdown can wait for pending notifications
+        self.flushed = asyncio.Event()
+        self.flushed.set()
+        self._pending_sends = 0
+
+        # Set while Telegram is reachable; a background task restores it after a connection loss
+        self.connected = asyncio.Event()
+        self._reconnect_task: Optional[asyncio.Task] = None
+
+        # Coalesce plain text messages per channel; batches wait while Telegram is unreachable
+        self._batcher = MessageBatcher(
+            self._send_text,
+            float(os.getenv("TELEGRAM_BATCH_INTERVAL", DEFAULT_BATCH_INTERVAL)),
+            self.connected,
+            int(os.getenv("TELEGRAM_BATCH_MAX_BUFFER", DEFAULT_BATCH_MAX_BUFFER))
+        )
+
         # Register command handlers
         self._register_handlers()
 
     def _register_handlers(self):
         """Register command and message handlers."""
-        # Command handlers
-        self.application.add_handler(CommandHandler("start", self._cmd_start))
-        self.application.add_handler(CommandHandler("help", self._cmd_help))
-
-         # Message handler for non-command messages
-        self.application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self._handle_message))
+        self.application.add_handlers([
+            # Command handlers
+            CommandHandler("start", self._cmd_start),
+            CommandHandler("help", self._cmd_help),
+            # Message handler for non-command messages
+            MessageHandler(_TEXT_NOCMD, self._handle_message)
+        ])
         
         # Error handler
         self.application.add_error_handler(self._error_handler)
 
+    @property
+    def ready(self) -> bool:
+        """Whether the bot is started and Telegram is reachable."""
+        return self.connected.is_set()
+
     async def start(self):
         """Start the Telegram bot."""
         self.logger.info("Starting Telegram bot")
-        await self.application.initialize()
-        await self.application.start()
+        self._batcher.start()
+        try:
+            await self.application.initialize()
+            await self.application.start()
+        except Exception:
+            self._connection_lost()
+            raise
         self.logger.info("Telegram bot started successfully")
         
         # Test the connection to channels
         try:
-            bot_info = await self.bot.get_me()
-            self.logger.info(f"Connected as {bot_info.first_name} (@{bot_info.username})")
+            await self._check_connection()
         except Exception as e:
             self.logger.error(f"Failed to get bot info: {e}")
+            self._connection_lost()
 
     async def stop(self):
         """Stop the Telegram bot."""
         self.logger.info("Stopping Telegram bot")
+        await self._batcher.stop()
+        if self._reconnect_task:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        self.connected.clear()
         await self.application.stop()
         await self.application.shutdown()
         self.logger.info("Telegram bot stopped successfully")
 
+    async def flush(self):
+        """
+        Deliver queued messages now and wait for every in-flight send to finish.
+
+        Batching carries on afterwards; only stop() ends it.
+        """
+        await self._batcher.flush()
+        await self.flushed.wait()
+
+    async def _check_connection(self):
+        """Confirm Telegram is reachable and mark the client ready."""
+        bot_info = await self.bot.get_me()
+        self.logger.info(f"Connected as {bot_info.first_name} (@{bot_info.username})")
+        self.connected.set()
+
+    def _connection_lost(self):
+        """Mark the client unavailable and start reconnecting in the background."""
+        self.connected.clear()
+        if self._reconnect_task is None or self._reconnect_task.done():
+            self.logger.warning("Telegram unreachable, will keep trying to reconnect")
+            self._reconnect_task = asyncio.create_task(self._reconnect())
+
+    async def _reconnect(self):
+        """Retry the connection with exponential backoff until it succeeds."""
+        delay = RECONNECT_MIN_DELAY
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                await self.application.initialize()
+                if not self.application.running:
+                    await self.application.start()
+                await self._check_connection()
+                self.logger.info("Reconnected to Telegram")
+                return
+            except Exception as e:
+                self.logger.debug(f"Telegram reconnection attempt failed: {e}")
+                delay = min(delay * 2, RECONNECT_MAX_DELAY)
 
     async def send_message(
         self,
@@ -81,11 +224,17 @@ class TelegramClient:
         channel: Optional[Union[str, int]] = None,
         media_type: Optional[str] = None,
         media_path: Optional[str] = None,
-        parse_mode: Optional[str] = None
+        parse_mode: Optional[str] = None,
+        flush: bool = False
     ) -> Optional[Any]:
         """
         Send a message or media to the specified channel.
         
+        Plain text messages are queued and sent together with others for the
+        same channel; media, formatted messages and flush=True go out at once.
+        While Telegram is unreachable, flush=True text is queued as well so it
+        goes out once the connection is back.
+        
         Args:
             content: Text message or caption for media
             channel: Can be one of:
@@ -95,26 +244,67 @@ class TelegramClient:
             media_type: Type of media ("photo", "video", "document", "audio" etc.) if sending media
             media_path: Path to the media file if sending media
             parse_mode: Message parsing mode (default: None)
+            flush: Send immediately instead of batching
         
         Returns:
-            Message response or None if sending failed
+            Message response or None if sending failed; for queued messages, a
+            future resolved with the response once the batch is sent
         """
-        channel_map = {
-            "highborn": self.highborn_channel_id,
-            "townsquare": self.townsquare_channel_id,
-            "smallfolk": self.smallfolk_channel_id,
-            "raven": self.raven_channel_id,
-            "maester": self.maester_channel_id,
-            "bunker": self.bunker_channel_id,
-            "whispers": self.whispers_channel_id,  # Default channel
-        }
+        if not (media_type or media_path or parse_mode) and (not flush or not self.ready):
+            return self._batcher.add(content, channel)
+
+        return await self._deliver(content, channel, media_type, media_path, parse_mode)
+
+    async def _send_text(self, content: str, channel: Optional[Union[str, int]]) -> Optional[Any]:
+        """Deliver a batch of plain text messages."""
+        return await self._deliver(content, channel, None, None, None)
+
+    async def _deliver(
+        self,
+        content: str,
+        channel: Optional[Union[str, int]],
+        media_type: Optional[str],
+        media_path: Optional[str],
+        parse_mode: Optional[str]
+    ) -> Optional[Any]:
+        """Send right away, tracking the send so flush() can wait for it."""
+        self._pending_sends += 1
+        self.flushed.clear()
+        try:
+            return await self._send(content, channel, media_type, media_path, parse_mode)
+        finally:
+            self._pending_sends -= 1
+            if not self._pending_sends:
+                self.flushed.set()
+
+    def _resolve_channel(self, channel: Optional[Union[str, int]]) -> Optional[Union[str, int]]:
+        """
+        Map a channel name or ID to the chat ID to send to.
         
+        Args:
+            channel: Channel name (any case), direct channel ID, or None for the default
+            
+        Returns:
+            The chat ID, or None if the channel is not configured
+        """
         if isinstance(channel, str):
-            target_channel_id = channel_map.get(channel.lower(), channel)
-        else:
-            target_channel_id = channel if isinstance(channel, int) else self.whispers_channel_id
+            # Names are almost always passed in lower case already, so try that before lowering
+            target_channel_id = self._channel_map.get(channel)
+            if target_channel_id is None:
+                target_channel_id = self._channel_map.get(channel.lower(), channel)
+            return target_channel_id
+        return channel if isinstance(channel, int) else self.whispers_channel_id
 
-        
+    async def _send(
+        self,
+        content: str,
+        channel: Optional[Union[str, int]],
+        media_type: Optional[str],
+        media_path: Optional[str],
+        parse_mode: Optional[str]
+    ) -> Optional[Any]:
+        """Resolve the target channel and deliver a message; see send_message."""
+        target_channel_id = self._resolve_channel(channel)
         if not target_channel_id:
             self.logger.warning("No target channel ID available")
             return None
@@ -128,35 +318,32 @@ class TelegramClient:
                     parse_mode=parse_mode
                 )
             
-            # Check if media file exists
-            if not os.path.exists(media_path):
+            media_type = media_type.lower()
+            send_func = self._media_senders.get(media_type)
+            if not send_func:
+                self.logger.error(f"Unsupported media type: {media_type}")
+                return None
+            
+            # Media message - read the file off the event loop and send it
+            try:
+                media_bytes = await asyncio.to_thread(Path(media_path).read_bytes)
+            except FileNotFoundError:
                 self.logger.error(f"Media file not found: {media_path}")
                 return None
             
-            # Media message - open the file and send
-            with open(media_path, 'rb') as media_file:
-                media_senders = {
-                    "photo": self.bot.send_photo,
-                    "video": self.bot.send_video,
-                    "document": self.bot.send_document,
-                    "audio": self.bot.send_audio,
-                    "voice": self.bot.send_voice
-                }
-                
-                send_func = media_senders.get(media_type.lower())
-                if send_func:
-                    return await send_func(
-                        chat_id=target_channel_id,
-                        **{media_type: media_file},
-                        caption=content,
-                        parse_mode=parse_mode
-                    )
-                else:
-                    self.logger.error(f"Unsupported media type: {media_type}")
-                    return None
+            return await send_func(
+                chat_id=target_channel_id,
+                **{media_type: InputFile(media_bytes, filename=os.path.basename(media_path))},
+                caption=content,
+                parse_mode=parse_mode
+            )
         
         except Exception as e:
             self.logger.error(f"Failed to send message to channel {target_channel_id}: {e}")
+            # BadRequest and TimedOut are NetworkErrors too, but they concern this one
+            # request (rejected, or slow as with a large upload), not the connection
+            if isinstance(e, NetworkError) and not isinstance(e, (BadRequest, TimedOut)):
+                self._connection_lost()
             return None
 
 
@@ -216,15 +403,8 @@ class TelegramClient:
             update: Update object that caused the error
             context: Context containing error information
         """
-        # Log the error
-        self.logger.error(f"Exception while handling an update: {context.error}")
-        
-        # Extract error details
-        error_traceback = "".join(
-            traceback.format_exception(
-                None, context.error, context.error.__traceback__
-            )
+        # Log the error with its traceback; the formatter renders it only if the record is emitted
+        self.logger.error(
+            "Exception while handling an update: %s", context.error,
+            exc_info=(type(context.error), context.error, context.error.__traceback__)
         )
-        
-        # Log detailed error traceback
-        self.logger.error(f"Traceback: {error_traceback}")
\ No newline at end of file
@@ -1,10 +1,33 @@
 # src/utils.py
+import atexit
+import functools
 import logging
+import logging.handlers
 import os
+import queue
 import sys
 
 import colorlog
 
+# Rotate the log file at this size, keeping this many old files
+LOG_MAX_BYTES = 50_000_000
+LOG_BACKUP_COUNT = 5
+
+# Units for format_timedelta, largest first
+_UNITS = ((86400, "d"), (3600, "h"), (60, "m"), (1, "s"))
+
+# Background thread writing queued log records to the console and file handlers
+_log_listener = None
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves message and traceback formatting to the listener thread."""
+    
+    def prepare(self, record):
+        # The stock prepare() formats the record on the calling thread so it can be
+        # pickled; this queue stays in-process, so the record is passed on as it is
+        return record
+
 
 def setup_logging(level_name="INFO"):
     """Set up logging configuration."""
@@ -41,7 +64,12 @@ def setup_logging(level_name="INFO"):
     logs_dir = os.path.join(os.getcwd(), 'logs')
     os.makedirs(logs_dir, exist_ok=True)
     
-    file_handler = logging.FileHandler(os.path.join(logs_dir, 'grandmaster.log'))
+    file_handler = logging.handlers.RotatingFileHandler(
+        os.path.join(logs_dir, 'grandmaster.log'),
+        maxBytes=LOG_MAX_BYTES,
+        backupCount=LOG_BACKUP_COUNT,
+        delay=True
+    )
     file_handler.setLevel(level)
     file_formatter = logging.Formatter(
         "%(asctime)s [%(levelname)s] %(name)s: %(message)s", 
@@ -49,9 +77,17 @@ def setup_logging(level_name="INFO"):
     )
     file_handler.setFormatter(file_formatter)
     
-    # Add handlers to logger
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    # Loggers only enqueue records; a listener thread formats them and does the console and file writes
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+    
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(_DeferredQueueHandler(log_queue))
+    _log_listener = logging.handlers.QueueListener(
+        log_queue, console_handler, file_handler, respect_handler_level=True
+    )
+    _log_listener.start()
     
     # Create specific loggers for each component
     component_loggers = ['grandmaster', 'grandmaster.websocket', 'grandmaster.telegram', 'grandmaster.scheduler']
@@ -62,20 +98,27 @@ def setup_logging(level_name="INFO"):
     return logger
 
 
+def _stop_log_listener():
+    """Write out any queued log records before the interpreter exits."""
+    if _log_listener is not None:
+        _log_listener.stop()
+
+
+atexit.register(_stop_log_listener)
+
+
 def format_timedelta(seconds):
     """Format seconds into a human-readable time string."""
-    days, remainder = divmod(seconds, 86400)
-    hours, remainder = divmod(remainder, 3600)
-    minutes, seconds = divmod(remainder, 60)
-    
+    return _format_seconds(int(seconds))
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_seconds(seconds):
+    """Format a whole number of seconds; uptimes repeat across status polls, so results are cached."""
     parts = []
-    if days > 0:
-        parts.append(f"{int(days)}d")
-    if hours > 0:
-        parts.append(f"{int(hours)}h")
-    if minutes > 0:
-        parts.append(f"{int(minutes)}m")
-    if seconds > 0 or not parts:
-        parts.append(f"{int(seconds)}s")
+    for unit_seconds, suffix in _UNITS:
+        count, seconds = divmod(seconds, unit_seconds)
+        if count or (unit_seconds == 1 and not parts):
+            parts.append(f"{count}{suffix}")
     
-    return " ".join(parts)
\ No newline at end of file
+    return " ".join(parts)
@@ -6,7 +6,7 @@ Handles connections and communication with client applications.
 import asyncio
 import json
 import logging
-import os
+import time
 from typing import Dict, Set, Any, Optional
 
 import websockets
@@ -15,6 +15,34 @@ from websockets.exceptions import ConnectionClosed
 
 from .config import get_websocket_config
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so one except clause covers both
+# Outgoing messages are UTF-8 JSON bytes, sent as binary frames without re-encoding;
+# the bundled clients parse binary and text frames alike
+if orjson is not None:
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+else:
+    _loads = json.loads
+
+    def _dumps(obj: Any) -> bytes:
+        """Serialize to UTF-8 JSON bytes."""
+        return json.dumps(obj).encode()
+
+# Maximum number of broadcast sends in flight at once
+BROADCAST_CONCURRENCY = 64
+
+# Maximum number of connections closed at once during shutdown
+CLOSE_CONCURRENCY = 256
+
+# Write buffer high-water mark in bytes (websockets default is 64 KiB); control
+# frames are small, so a slow peer applies backpressure to its sender sooner
+WRITE_LIMIT = 16 * 1024
+
 class AppConnection:
     """Represents a connected application."""
     
@@ -28,24 +56,26 @@ class AppConnection:
         """
         self.websocket = websocket
         self.app_name = app_name or "unknown"
-        self.connected_at = asyncio.get_event_loop().time()
+        self.connected_at = time.monotonic()
         self.last_message_at = self.connected_at
         self.remote_address = f"{websocket.remote_address[0]}:{websocket.remote_address[1]}"
+        # "app@host:port" for log lines, rebuilt only when the app name changes
+        self.info = f"{self.app_name}@{self.remote_address}"
     
-    @property
-    def id(self) -> int:
-        """Get the unique ID of this connection."""
-        return id(self.websocket)
-    
-    @property
-    def info(self) -> str:
-        """Get a string representation of this connection."""
-        return f"{self.app_name}@{self.remote_address}"
+    def identify(self, app_name: str):
+        """
+        Set the application name reported by the client.
+        
+        Args:
+            app_name: Name of the application
+        """
+        self.app_name = app_name
+        self.info = f"{app_name}@{self.remote_address}"
     
     @property
     def uptime(self) -> float:
         """Get the uptime of this connection in seconds."""
-        return asyncio.get_event_loop().time() - self.connected_at
+        return time.monotonic() - self.connected_at
     
     async def send(self, message: Dict[str, Any]) -> bool:
         """
@@ -54,11 +84,23 @@ class AppConnection:
         Args:
             message: The message to send
             
+        Returns:
+            True if the message was sent successfully, False otherwise
+        """
+        return await self.send_payload(_dumps(message))
+    
+    async def send_payload(self, payload: bytes) -> bool:
+        """
+        Send an already serialized message to the application as a binary frame.
+        
+        Args:
+            payload: The JSON-encoded message
+            
         Returns:
             True if the message was sent successfully, False otherwise
         """
         try:
-            await self.websocket.send(json.dumps(message))
+            await self.websocket.send(payload)
             return True
         except Exception:
             return False
@@ -77,9 +119,10 @@ class WebSocketServer:
         self.host = ws_config["host"]
         self.port = ws_config["port"]
         
-        self.connections: Dict[int, AppConnection] = {}
+        self.connections: Set[AppConnection] = set()
         self.server = None
         self._stopping = False
+        self._broadcast_sem = asyncio.Semaphore(BROADCAST_CONCURRENCY)
 
     async def start(self):
         """Start the WebSocket server."""
@@ -88,7 +131,9 @@ class WebSocketServer:
             self.server = await websockets.serve(
                 self._handle_connection,
                 self.host,
-                self.port
+                self.port,
+                compression=None,  # Small JSON frames don't benefit from per-message deflate
+                write_limit=WRITE_LIMIT
             )
             self.logger.info("WebSocket server started successfully")
         except OSError as e:
@@ -101,16 +146,18 @@ class WebSocketServer:
             self.logger.info("Stopping WebSocket server")
             self._stopping = True
             
-            # Close all connections
-            close_tasks = []
-            for conn in self.connections.values():
-                try:
-                    close_tasks.append(conn.websocket.close(1001, "Server shutting down"))
-                except Exception:
-                    pass
+            # Close all connections, a bounded number of closing handshakes at a time
+            close_sem = asyncio.Semaphore(CLOSE_CONCURRENCY)
+            
+            async def close_one(conn: AppConnection):
+                async with close_sem:
+                    try:
+                        await conn.websocket.close(1001, "Server shutting down")
+                    except Exception:
+                        pass
             
-            if close_tasks:
-                await asyncio.gather(*close_tasks, return_exceptions=True)
+            if self.connections:
+                await asyncio.gather(*(close_one(conn) for conn in list(self.connections)))
             
             # Close the server
             self.server.close()
@@ -127,17 +174,23 @@ class WebSocketServer:
         if not self.connections:
             return
         
-        self.logger.debug(f"Broadcasting message to {len(self.connections)} clients")
+        self.logger.debug("Broadcasting message to %d clients", len(self.connections))
+        
+        # Serialize once; every send shares the same payload
+        payload = _dumps(message)
         
-        tasks = []
-        for conn in self.connections.values():
-            tasks.append(conn.send(message))
+        async def send_one(conn: AppConnection) -> bool:
+            async with self._broadcast_sem:
+                return await conn.send_payload(payload)
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        results = await asyncio.gather(
+            *(send_one(conn) for conn in list(self.connections)),
+            return_exceptions=True
+        )
         failed = sum(1 for r in results if r is not True)
         
         if failed:
-            self.logger.warning(f"Failed to send broadcast message to {failed} clients")
+            self.logger.warning("Failed to send broadcast message to %d clients", failed)
 
     async def _handle_connection(self, websocket: WebSocketServerProtocol, path: str):
         """
@@ -151,8 +204,8 @@ class WebSocketServer:
         
         try:
             # Register the connection
-            self.connections[conn.id] = conn
-            self.logger.info(f"New connection: {conn.info}")
+            self.connections.add(conn)
+            self.logger.info("New connection: %s", conn.info)
             
             # Listen for messages
             async for message in websocket:
@@ -161,41 +214,41 @@ class WebSocketServer:
                 
                 try:
                     # Parse the JSON message
-                    data = json.loads(message)
+                    data = _loads(message)
                     
-                    # Update app name if provided
-                    if 'app' in data and isinstance(data['app'], str):
-                        conn.app_name = data['app']
-                        self.logger.info(f"Connection {conn.id} identified as '{conn.app_name}'")
+                    # Update app name if provided and changed
+                    if 'app' in data and isinstance(data['app'], str) and data['app'] != conn.app_name:
+                        conn.identify(data['app'])
+                        self.logger.info("Connection %s identified as '%s'", conn.remote_address, conn.app_name)
                     
                     # Update last message timestamp
-                    conn.last_message_at = asyncio.get_event_loop().time()
+                    conn.last_message_at = time.monotonic()
                     
                     # Extract and relay content
                     if 'content' in data:
                         content = data['content']
-                        self.logger.info(f"Received from {conn.info}: {content}")
+                        self.logger.info("Received from %s: %s", conn.info, content)
                         
                         # Format message for Telegram
                         formatted_message = f"📨 Message from {conn.app_name}:\n{content}"
                         await self.grandmaster.send_message(formatted_message, "bunker")
                     else:
-                        self.logger.warning(f"Message from {conn.info} has no 'content' field")
+                        self.logger.warning("Message from %s has no 'content' field", conn.info)
                 
                 except json.JSONDecodeError:
-                    self.logger.error(f"Invalid JSON received from {conn.info}")
+                    self.logger.error("Invalid JSON received from %s", conn.info)
         
         except ConnectionClosed:
-            self.logger.info(f"Connection closed: {conn.info}")
+            self.logger.info("Connection closed: %s", conn.info)
         
         except Exception as e:
-            self.logger.error(f"Error handling connection {conn.info}: {str(e)}")
+            self.logger.error("Error handling connection %s: %s", conn.info, e)
         
         finally:
             # Remove connection from registry
-            if conn.id in self.connections:
-                del self.connections[conn.id]
-                self.logger.info(f"Connection removed: {conn.info}")
+            if conn in self.connections:
+                self.connections.discard(conn)
+                self.logger.info("Connection removed: %s", conn.info)
                 
     def get_status(self) -> Dict[str, Any]:
         """
@@ -205,7 +258,7 @@ class WebSocketServer:
             Dictionary with status information
         """
         connections_info = []
-        for conn in self.connections.values():
+        for conn in self.connections:
             connections_info.append({
                 "app": conn.app_name,
                 "remote": conn.remote_address,